@@ -0,0 +1,95 @@
+import argparse
+
+from . import suite
+from .generator import TreeSpec
+
+
+def _print(result: suite.Result):
+    peak = "-" if result.peak_bytes < 0 else f"{result.peak_bytes / 2**20:.1f}"
+    print(
+        f"{result.nodes:>10,d} nodes | "
+        f"{result.benchmark:<26} | "
+        f"{result.seconds:10.3f} s | "
+        f"peak [MB]: {peak}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time snoopy on synthetic directory trees.",
+    )
+    parser.add_argument(
+        "--nodes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="Number of files and folders of each synthetic tree.",
+    )
+    parser.add_argument(
+        "--only",
+        type=str,
+        nargs="+",
+        choices=list(suite.BENCHMARKS),
+        help="Run only the given benchmarks.",
+    )
+    parser.add_argument("--fan-out", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--files-per-folder", type=int, default=20)
+    parser.add_argument(
+        "--sizes",
+        type=str,
+        default="lognormal",
+        choices=["empty", "uniform", "lognormal"],
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the second, traced run that records peak memory.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Save the results under the given filename in json format.",
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        help="Print time ratios against results saved with --output.",
+    )
+    args = parser.parse_args()
+
+    results = []
+    for nodes in args.nodes:
+        spec = TreeSpec(
+            nodes,
+            fan_out=args.fan_out,
+            depth=args.depth,
+            files_per_folder=args.files_per_folder,
+            sizes=args.sizes,
+            seed=args.seed,
+        )
+        results += suite.run(
+            nodes,
+            names=args.only,
+            memory=not args.no_memory,
+            spec=spec,
+            log=_print,
+        )
+
+    if args.output is not None:
+        suite.save(results, args.output)
+
+    if args.compare is not None:
+        print()
+        for result, ratio in suite.compare(suite.load(args.compare), results):
+            print(
+                f"{result.nodes:>10,d} nodes | "
+                f"{result.benchmark:<26} | "
+                f"{ratio:6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import contextlib
+import math
+import os
+import random
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+
+@dataclass
+class TreeSpec:
+    nodes: int
+    fan_out: int = field(default=8, kw_only=True)
+    depth: int = field(default=5, kw_only=True)
+    files_per_folder: int = field(default=20, kw_only=True)
+    sizes: Literal["empty", "uniform", "lognormal"] = field(
+        default="lognormal", kw_only=True
+    )
+    mean_size: float = field(default=16 * 1024, kw_only=True)
+    max_size: int = field(default=2**30, kw_only=True)
+    seed: int = field(default=0, kw_only=True)
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+
+    def num_folders(self):
+        wanted = max(self.nodes // (self.files_per_folder + 1), 0)
+        possible = sum(self.fan_out**k for k in range(1, self.depth + 1))
+        return min(wanted, possible)
+
+    def file_size(self):
+        if self.sizes == "empty":
+            return 0
+        if self.sizes == "uniform":
+            size = self.rng.uniform(0, 2 * self.mean_size)
+        else:
+            # the mean of a lognormal distribution is exp(mu + sigma**2 / 2)
+            sigma = 1.5
+            mu = math.log(max(self.mean_size, 1.0)) - sigma**2 / 2
+            size = self.rng.lognormvariate(mu, sigma)
+        return min(int(size), self.max_size)
+
+
+def _iter_folders(root: Path, fan_out: int, depth: int):
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for i in range(fan_out):
+                folder = parent / f"dir_{i}"
+                next_level.append(folder)
+                yield folder
+        level = next_level
+
+
+def generate(spec: TreeSpec, root: str | Path):
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    folders = [root]
+    num_folders = spec.num_folders()
+    for folder in _iter_folders(root, spec.fan_out, spec.depth):
+        if len(folders) > num_folders:
+            break
+        folder.mkdir()
+        folders.append(folder)
+
+    num_files = max(spec.nodes - num_folders, 0)
+    for i in range(num_files):
+        folder = folders[spec.rng.randrange(len(folders))]
+        with open(folder / f"file_{i}.dat", "wb") as file:
+            # Sparse files keep large synthetic trees cheap on disk.
+            file.truncate(spec.file_size())
+
+    return root
+
+
+@contextlib.contextmanager
+def synthetic_tree(spec: TreeSpec, *, dir: str | Path | None = None):
+    with tempfile.TemporaryDirectory(prefix="snoopy-bench-", dir=dir) as tmp:
+        yield generate(spec, os.path.join(tmp, "tree"))
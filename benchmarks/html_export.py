@@ -0,0 +1,53 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import snoopy
+from snoopy import core, export
+
+from .generator import TreeSpec, generate
+
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    tic = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - tic
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the rich and the native html export.",
+    )
+    parser.add_argument("--nodes", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        generate(TreeSpec(args.nodes), root)
+        fmt = snoopy.Formatter(snoopy.snoop(root))
+        print(f"lines: {fmt.num_lines():,d}")
+
+        writers = {"native": export.save_html}
+        if core._rich_installed():
+            writers["rich"] = core.save_html
+
+        for name, writer in writers.items():
+            filename = Path(tmp) / f"{name}.html"
+            elapsed, peak = measure(writer, fmt, filename)
+            size = os.path.getsize(filename)
+            print(
+                f"{name:>6}: {elapsed:8.2f} s | "
+                f"peak {peak / 2**20:8.1f} MB | "
+                f"file {size / 2**20:8.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
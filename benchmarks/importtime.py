@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Module imported by the statement, and modules it must not pull in.
+TARGETS = {
+    "import snoopy": "snoopy",
+    "import snoopy.__main__": "snoopy.__main__",
+}
+DEFERRED = (
+    "rich",
+    "numpy",
+    "importlib.metadata",
+    "sqlite3",
+    "hashlib",
+    "json",
+    "pstats",
+    "concurrent.futures",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def importtime(statement: str):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is not None:
+            cumulative[match[4]] = int(match[2])
+    return cumulative
+
+
+def measure(statement: str, module: str, runs: int):
+    timings = [importtime(statement) for _ in range(runs)]
+    # The minimum is the least noisy estimate of the actual cost.
+    microseconds = min(timing[module] for timing in timings)
+    return microseconds, set(timings[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that importing snoopy and starting the CLI stay fast.",
+    )
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Save the timings under the given filename in json format.",
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        help="Fail if slower than the timings saved with --output.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="Allowed slowdown factor against --compare.",
+    )
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    failed = False
+    results = {}
+    for statement, module in TARGETS.items():
+        microseconds, modules = measure(statement, module, args.runs)
+        results[statement] = microseconds
+        line = f"{statement:<24} | {microseconds / 1e3:8.2f} ms"
+
+        before = baseline.get(statement)
+        if before is not None:
+            ratio = microseconds / max(before, 1)
+            line += f" | {ratio:6.2f}x"
+            if ratio > args.tolerance:
+                line += " | SLOWER"
+                failed = True
+        print(line)
+
+        eager = [name for name in DEFERRED if name in modules]
+        if eager:
+            print(f"  imported eagerly: {', '.join(eager)}")
+            failed = True
+
+    if args.output is not None:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import snoopy
+from snoopy import core, export, filtering, pruning, sorting, traverse
+
+from .generator import TreeSpec, synthetic_tree
+
+
+@dataclass
+class Result:
+    benchmark: str
+    nodes: int
+    seconds: float
+    peak_bytes: int
+
+
+@dataclass
+class _Context:
+    path: Path
+    tmp: Path
+    tree: snoopy.Folder | None = field(default=None)
+
+
+def _count(matcher: Callable, tree: snoopy.Folder):
+    return sum(1 for item in traverse(tree) if matcher(item))
+
+
+def _bench_snoop(ctx: _Context):
+    ctx.tree = snoopy.Dog().snoop(ctx.path)
+
+
+def _sorting(func: Callable):
+    def bench(ctx: _Context):
+        func(ctx.tree, inplace=True)
+
+    return bench
+
+
+def _bench_prune(ctx: _Context):
+    pruning.by_size(ctx.tree, "<1 KB")
+    ctx.tree.unhide()
+
+
+def _filtering(matcher: Callable):
+    def bench(ctx: _Context):
+        _count(matcher, ctx.tree)
+
+    return bench
+
+
+def _bench_formatter(ctx: _Context):
+    str(snoopy.Formatter(ctx.tree))
+
+
+def _bench_html_native(ctx: _Context):
+    export.save_html(snoopy.Formatter(ctx.tree), ctx.tmp / "native.html")
+
+
+def _bench_html_rich(ctx: _Context):
+    core.save_html(snoopy.Formatter(ctx.tree), ctx.tmp / "rich.html")
+
+
+BENCHMARKS = {
+    "snoop": _bench_snoop,
+    "sorting.by_size": _sorting(sorting.by_size),
+    "sorting.alphabetic": _sorting(sorting.alphabetic),
+    "sorting.by_last_modified": _sorting(sorting.by_last_modified),
+    "sorting.by_num_files": _sorting(sorting.by_num_files),
+    "pruning.by_size": _bench_prune,
+    "filtering.Name": _filtering(filtering.Name("file_1.dat", "dir_1")),
+    "filtering.Regex": _filtering(filtering.Regex(r".*/dir_1/.*\.dat$")),
+    "filtering.Pattern": _filtering(filtering.Pattern("dir_*/file_1*")),
+    "filtering.hidden": _filtering(filtering.hidden),
+    "Formatter.__str__": _bench_formatter,
+    "save_html[native]": _bench_html_native,
+    "save_html[rich]": _bench_html_rich,
+}
+
+
+def _measure(func: Callable, ctx: _Context, memory: bool):
+    gc.collect()
+    tic = time.perf_counter()
+    func(ctx)
+    seconds = time.perf_counter() - tic
+
+    peak = -1
+    if memory:
+        # A second, traced run: tracemalloc slows Python code down too
+        # much to share the timed run.
+        gc.collect()
+        tracemalloc.start()
+        func(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return seconds, peak
+
+
+def run(
+    nodes: int,
+    *,
+    names: list[str] | None = None,
+    memory: bool = True,
+    spec: TreeSpec | None = None,
+    log: Callable[[Result], None] | None = None,
+):
+    if spec is None:
+        spec = TreeSpec(nodes)
+    if names is None:
+        names = list(BENCHMARKS)
+    if not core._rich_installed() and "save_html[rich]" in names:
+        names.remove("save_html[rich]")
+
+    results = []
+    with synthetic_tree(spec) as path, tempfile.TemporaryDirectory() as tmp:
+        ctx = _Context(path, Path(tmp))
+        # Every other benchmark works on a scanned tree.
+        if "snoop" not in names:
+            _bench_snoop(ctx)
+
+        for name in names:
+            seconds, peak = _measure(BENCHMARKS[name], ctx, memory)
+            result = Result(name, nodes, seconds, peak)
+            results.append(result)
+            if log is not None:
+                log(result)
+
+    return results
+
+
+def save(results: list[Result], filename: str | Path):
+    data = {
+        "snoopy": snoopy.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(filename, mode="w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+
+
+def load(filename: str | Path):
+    with open(filename, encoding="utf-8") as file:
+        data = json.load(file)
+    return [Result(**result) for result in data["results"]]
+
+
+def compare(old: list[Result], new: list[Result]):
+    baseline = {(r.benchmark, r.nodes): r for r in old}
+    for result in new:
+        before = baseline.get((result.benchmark, result.nodes))
+        if before is None:
+            continue
+        yield result, result.seconds / max(before.seconds, 1e-9)
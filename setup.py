@@ -22,7 +22,7 @@ setup(
     author_email="styfen.schaer.blog@gmail.com",
     url="https://github.com/styfenschaer/Snoopy",
     download_url="https://github.com/styfenschaer/Snoopy",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     extras_require={"dev": ["rich"]},
     entry_points={
         "console_scripts": [
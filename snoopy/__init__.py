@@ -1,5 +1,47 @@
-from . import filtering, formatting, progress, pruning, sorting
+import importlib
+
+from . import filtering, formatting, instrument, progress, pruning, sorting
 from ._version import __version__
-from .core import (Dog, Error, File, Folder, Formatter, clone, display,
+from .core import (Dog, Error, File, Folder, Formatter, clone, display, du,
                    snapshot, snoop, traverse)
 from .gimmick import praise
+
+# Imported on first access to keep `import snoopy` and the CLI fast.
+_lazy_modules = (
+    "batch",
+    "checkpoint",
+    "dedup",
+    "export",
+    "hashcache",
+    "index",
+    "predicates",
+    "profiling",
+    "sampling",
+    "stats",
+    "timeline",
+)
+_lazy_attributes = {
+    "duplicates": "dedup",
+    "estimate": "sampling",
+    "Estimator": "sampling",
+    "export_json": "export",
+    "load_json": "export",
+    "HashCache": "hashcache",
+    "iter_snoop_many": "batch",
+    "snoop_many": "batch",
+    "history": "timeline",
+    "SnapshotStore": "timeline",
+}
+
+
+def __getattr__(name: str):
+    if name in _lazy_modules:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _lazy_attributes:
+        module = importlib.import_module(f".{_lazy_attributes[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_lazy_modules, *_lazy_attributes])
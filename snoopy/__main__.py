@@ -1,21 +1,16 @@
 import argparse
 import pathlib
-from importlib.metadata import distribution
+import sys
 
-from .core import Formatter, display, get_created, snapshot, snoop
+from . import filtering, pruning, sorting
+from .core import Dog, Formatter, display, get_created, snapshot
 from .formatting import ItemName, ItemSize, default
+from .instrument import ScanStats
 
 this_path = pathlib.Path(__file__).parent
 
 
-dist = distribution("snoopy")
-author = dist.metadata["Author"]
-version = dist.metadata["Version"]
-url = dist.metadata["Download-URL"]
-date = get_created(this_path).date()
-
-
-_welcome_message = f"""\
+_welcome_message = """\
 Welcome to Snoopy - Your loyal directory snooper!
 
                    / \__
@@ -38,13 +33,38 @@ Download-URL {url}
 
 
 def welcome():
-    print(_welcome_message)
+    # The metadata lookup scans sys.path and is slow on network drives,
+    # so it is only done for the banner.
+    from importlib.metadata import distribution
+
+    dist = distribution("snoopy")
+    print(
+        _welcome_message.format(
+            version=dist.metadata["Version"],
+            date=get_created(this_path).date(),
+            author=dist.metadata["Author"],
+            url=dist.metadata["Download-URL"],
+        )
+    )
 
 
 def good_boy():
     print("Woof woof! 🐶")
 
 
+_sort_keys = {
+    "name": sorting.alphabetic,
+    "size": sorting.by_size,
+    "modified": sorting.by_last_modified,
+    "accessed": sorting.by_last_access,
+    "created": sorting.by_created,
+    "files": sorting.by_num_files,
+    "folders": sorting.by_num_folders,
+    "errors": sorting.by_num_errors,
+    "kind": sorting.by_kind,
+}
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Analyze and display folder structure and information.",
@@ -64,6 +84,13 @@ def main():
         choices=[0, 1, 2],
         help="Set the verbosity level.",
     )
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="text",
+        choices=["text", "ndjson"],
+        help="Output format; ndjson streams one record per item while snooping.",
+    )
     parser.add_argument(
         "--rich",
         action="store_true",
@@ -74,6 +101,11 @@ def main():
         type=str,
         help="Save the tree under the given filename in html format.",
     )
+    parser.add_argument(
+        "--native-html",
+        action="store_true",
+        help="Save html with the built-in streaming writer instead of rich.",
+    )
     parser.add_argument(
         "--no-display",
         action="store_true",
@@ -103,6 +135,11 @@ def main():
         default=float("inf"),
         help="Maximum number of subfolders to display per folder.",
     )
+    parser.add_argument(
+        "--du",
+        action="store_true",
+        help="Only keep folder totals down to --max-depth, not single files.",
+    )
     parser.add_argument(
         "--name-only",
         action="store_true",
@@ -113,6 +150,54 @@ def main():
         action="store_true",
         help="Only display the object name with its size.",
     )
+    parser.add_argument(
+        "--exclude",
+        type=str,
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Skip files and folders matching the glob pattern while snooping; "
+        "can be repeated.",
+    )
+    parser.add_argument(
+        "--gitignore",
+        action="store_true",
+        help="Skip what the .gitignore file in the directory excludes.",
+    )
+    parser.add_argument(
+        "--sort",
+        type=str,
+        choices=list(_sort_keys),
+        help="Sort the items of each folder by the given key.",
+    )
+    parser.add_argument(
+        "--prune-size",
+        type=str,
+        metavar="EXPR",
+        help="Hide items whose size matches the expression, e.g. '<1 MB'.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of threads listing directories concurrently.",
+    )
+    parser.add_argument(
+        "--top-files",
+        type=int,
+        metavar="N",
+        help="Keep only the N largest files of each folder and count the rest.",
+    )
+    parser.add_argument(
+        "--one-file-system",
+        action="store_true",
+        help="Do not descend into folders on other file systems.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print scan timing and syscall statistics to stderr.",
+    )
     parser.add_argument(
         "--good-boy!",
         action="store_true",
@@ -127,10 +212,53 @@ def main():
     if not args.path:
         return welcome()
 
-    folder = snoop(
-        args.path,
+    if args.format == "ndjson" and (args.sort or args.prune_size):
+        parser.error("--sort and --prune-size need the full tree, not ndjson")
+
+    excludes = []
+    if args.exclude:
+        excludes.append(filtering.Pattern(*args.exclude))
+    if args.gitignore:
+        # The patterns are matched against paths under the resolved root.
+        args.path = str(pathlib.Path(args.path).resolve())
+        gitignore = pathlib.Path(args.path) / ".gitignore"
+        if gitignore.is_file():
+            excludes.append(filtering.Pattern.from_gitignore(gitignore))
+
+    stats = ScanStats() if args.stats else None
+
+    dog = Dog(
         verbosity=args.verbosity,
+        stats=stats,
+        fold_files=args.du,
+        fold_depth=args.max_depth if args.du else float("inf"),
+        workers=args.workers,
+        one_file_system=args.one_file_system,
+        top_files=args.top_files,
     )
+    if excludes:
+        dog.ignore_folder = dog.ignore_file = filtering.chain(*excludes)
+
+    if args.format == "ndjson":
+        from .export import JsonWriter
+
+        dog.on_item = writer = JsonWriter(sys.stdout)
+        dog.on_done = writer.done
+        dog.snoop(args.path)
+        writer.close()
+        if stats is not None:
+            print(stats, file=sys.stderr)
+        return
+
+    folder = dog.snoop(args.path)
+
+    if stats is not None:
+        print(stats, file=sys.stderr)
+
+    if args.sort is not None:
+        _sort_keys[args.sort](folder, inplace=True)
+    if args.prune_size is not None:
+        pruning.by_size(folder, args.prune_size)
 
     if args.name_only:
         formatter = ItemName()
@@ -154,10 +282,10 @@ def main():
         if args.rich:
             display(fmt)
         else:
-            print(fmt)
+            fmt.write(sys.stdout)
 
     if args.filename is not None:
-        snapshot(fmt, filename=args.filename)
+        snapshot(fmt, filename=args.filename, native=args.native_html)
 
 
 if __name__ == "__main__":
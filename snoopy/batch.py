@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+from . import filtering
+from .core import Dog, Folder, _ignore_nothing
+from .sampling import Estimator
+
+
+@dataclass
+class Batch:
+    trees: dict[Path, Folder] = field(default_factory=dict)
+    times: dict[Path, float] = field(default_factory=dict)
+    elapsed: float = field(default=0.0, kw_only=True)
+
+    @property
+    def bytes(self):
+        return sum(tree.bytes for tree in self.trees.values())
+
+    @property
+    def files(self):
+        return sum(tree.num_deep_files for tree in self.trees.values())
+
+    @property
+    def folders(self):
+        return sum(tree.num_deep_folders for tree in self.trees.values())
+
+    @property
+    def errors(self):
+        return sum(len(tree.deep_errors) for tree in self.trees.values())
+
+    def summary(self):
+        width = max((len(str(path)) for path in self.trees), default=4)
+        lines = [
+            f"{'Root':<{width}} | {'Bytes':>16} | {'Files':>12} | {'Time':>8}",
+        ]
+        trees = sorted(self.trees.items(), key=lambda kv: kv[1].bytes, reverse=True)
+        for path, tree in trees:
+            lines.append(
+                f"{str(path):<{width}} | {tree.bytes:>16,d} | "
+                f"{tree.num_deep_files:>12,d} | {self.times[path]:>7.2f}s"
+            )
+        lines.append(
+            f"{'Total':<{width}} | {self.bytes:>16,d} | "
+            f"{self.files:>12,d} | {self.elapsed:>7.2f}s"
+        )
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
+
+
+def _root_dog(dog: Dog, path: Path, gitignore: bool):
+    root_dog = dataclasses.replace(dog)
+    if not gitignore:
+        return root_dog
+
+    file = path / ".gitignore"
+    if not file.is_file():
+        return root_dog
+
+    pattern = filtering.Pattern.from_gitignore(file)
+    for name in ("ignore_folder", "ignore_file"):
+        ignore = getattr(dog, name)
+        if ignore is _ignore_nothing:
+            setattr(root_dog, name, pattern)
+        else:
+            setattr(root_dog, name, filtering.chain(ignore, pattern))
+    return root_dog
+
+
+def _size_hint(dog: Dog, path: Path, samples: int):
+    # Scan time follows the number of entries rather than their bytes.
+    estimate = Estimator(path, dog=dog, seed=0).sample(samples).estimate()
+    return estimate.files.mean + estimate.folders.mean
+
+
+def iter_snoop_many(
+    paths: Iterable[Path | str],
+    *,
+    workers: int = 4,
+    dog: Dog | None = None,
+    gitignore: bool = False,
+    sizes: Mapping[Path | str, float] | None = None,
+    samples: int = 32,
+):
+    # Resolved, so that gitignore patterns anchored at the root match.
+    paths = list(dict.fromkeys(Path(path).resolve() for path in paths))
+    for path in paths:
+        if not (path.exists() and path.is_dir()):
+            raise ValueError(f"path must be an existing directory: {path}")
+
+    if dog is None:
+        dog = Dog()
+    if dog.checkpoint is not None:
+        raise ValueError("checkpoints cannot be shared between roots")
+
+    # Filters are shared by all roots; only gitignores differ per root.
+    dogs = {path: _root_dog(dog, path, gitignore) for path in paths}
+
+    # Every root lists its folders on one pool, and at most `workers` roots
+    # are walked at a time. Starting with the largest keeps the longest
+    # scan from being the last one left running.
+    pool = ThreadPoolExecutor(workers)
+    roots = ThreadPoolExecutor(workers)
+    try:
+        if sizes is None:
+            hints = pool.map(
+                lambda path: _size_hint(dogs[path], path, samples), paths
+            )
+            sizes = dict(zip(paths, hints))
+        else:
+            sizes = {Path(path).resolve(): size for path, size in sizes.items()}
+        paths.sort(key=lambda path: sizes.get(path, 0), reverse=True)
+
+        def scan(path: Path):
+            tic = time.perf_counter()
+            root_dog = dataclasses.replace(dogs[path], pool=pool)
+            tree = root_dog.snoop(path)
+            return path, tree, time.perf_counter() - tic
+
+        futures = [roots.submit(scan, path) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+    finally:
+        # Once the pool refuses new listings the roots still being walked
+        # end quickly. Queued listings are left to run: cancelled futures
+        # would never wake up the wait() of their root.
+        pool.shutdown(wait=False)
+        roots.shutdown(wait=True, cancel_futures=True)
+
+
+def snoop_many(
+    paths: Iterable[Path | str],
+    *,
+    workers: int = 4,
+    dog: Dog | None = None,
+    gitignore: bool = False,
+    sizes: Mapping[Path | str, float] | None = None,
+    samples: int = 32,
+    on_result: Callable[[Path, Folder], None] | None = None,
+):
+    tic = time.perf_counter()
+    batch = Batch()
+    for path, tree, seconds in iter_snoop_many(
+        paths,
+        workers=workers,
+        dog=dog,
+        gitignore=gitignore,
+        sizes=sizes,
+        samples=samples,
+    ):
+        batch.trees[path] = tree
+        batch.times[path] = seconds
+        if on_result is not None:
+            on_result(path, tree)
+    batch.elapsed = time.perf_counter() - tic
+    return batch
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import collections
+import json
+import os
+import time
+from pathlib import Path
+
+from .core import Folder, isfolder
+from .export import _apply_done, _done, _record, _restore
+
+_VERSION = 1
+
+
+def _journal_path(path: Path, generation: int):
+    return path.with_name(f"{path.name}.{generation}.journal")
+
+
+def _previous(path: Path):
+    # The journal of an existing checkpoint, which is only removed once
+    # the manifest points to the new one.
+    try:
+        with open(path, encoding="utf-8") as file:
+            manifest = json.load(file)
+        return path.with_name(manifest["journal"]), manifest.get("generation", -1)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, -1
+
+
+def _dumps(record: dict):
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+class CheckpointWriter:
+    # The journal is append-only: every listed folder adds its items and
+    # a "done" record. The small manifest next to it is replaced
+    # atomically and says which journal is current and how many of its
+    # bytes are committed.
+    def __init__(
+        self, path: str | Path, *, interval: float = 5.0, generation: int = 0
+    ):
+        self.path = Path(path)
+        self.generation = generation
+        self.journal_path = _journal_path(self.path, generation)
+        self.interval = interval
+        self.ids = {}
+        self.next_id = 0
+        self.committed = 0
+        self.last_commit = time.monotonic()
+        self.file = None
+
+    @classmethod
+    def create(cls, path: str | Path, tree: Folder, *, interval: float = 5.0):
+        # A new journal is written next to the old one, so that a crash
+        # before the first commit leaves the old checkpoint intact.
+        previous, generation = _previous(Path(path))
+        writer = cls(path, interval=interval, generation=generation + 1)
+        writer.file = open(writer.journal_path, mode="wb")
+
+        writer.ids[id(tree)] = writer.next_id
+        writer.next_id += 1
+        writer._write([_dumps(_record(tree, 0, None))])
+
+        # An already partially scanned tree is journaled as it is.
+        pending = collections.deque([tree])
+        while pending:
+            folder = pending.popleft()
+            if not folder.incomplete:
+                writer.listed(folder)
+                pending.extend(folder.folders)
+
+        writer.commit()
+        if previous is not None and previous != writer.journal_path:
+            previous.unlink(missing_ok=True)
+        return writer
+
+    @classmethod
+    def open(cls, path: str | Path, *, interval: float = 5.0):
+        tree, ids, manifest = _load(Path(path))
+        writer = cls(path, interval=interval)
+        writer.generation = manifest.get("generation", 0)
+        writer.journal_path = writer.path.with_name(manifest["journal"])
+        writer.ids = ids
+        writer.next_id = manifest["next_id"]
+        writer.committed = manifest["bytes"]
+
+        # Anything past the committed size is from an interrupted write.
+        writer.file = open(writer.journal_path, mode="r+b")
+        writer.file.truncate(writer.committed)
+        writer.file.seek(writer.committed)
+        return tree, writer
+
+    def listed(self, folder: Folder):
+        uid = self.ids[id(folder)]
+        lines = []
+        for item in folder.items:
+            child = self.next_id
+            self.next_id += 1
+            if isfolder(item):
+                self.ids[id(item)] = child
+            lines.append(_dumps(_record(item, child, uid)))
+        lines.append(_dumps(_done(folder, uid)))
+        self._write(lines)
+
+        if time.monotonic() - self.last_commit >= self.interval:
+            self.commit()
+
+    def _write(self, lines: list[str]):
+        self.file.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+    def commit(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.committed = self.file.tell()
+
+        manifest = {
+            "version": _VERSION,
+            "journal": self.journal_path.name,
+            "generation": self.generation,
+            "bytes": self.committed,
+            "next_id": self.next_id,
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, mode="w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, self.path)
+        self.last_commit = time.monotonic()
+
+    def close(self):
+        if self.file is not None:
+            self.commit()
+            self.file.close()
+            self.file = None
+
+
+def _load(path: Path):
+    with open(path, encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("version") != _VERSION:
+        raise ValueError(f"unsupported checkpoint version in {path}")
+
+    with open(path.with_name(manifest["journal"]), mode="rb") as file:
+        data = file.read(manifest["bytes"])
+
+    tree = None
+    folders = {}
+    for line in data.decode("utf-8").splitlines():
+        record = json.loads(line)
+        if record["kind"] == "done":
+            folder = folders[record["id"]]
+            folder.incomplete = False
+            _apply_done(folder, record)
+            continue
+
+        parent = None if record["parent"] is None else folders[record["parent"]]
+        item = _restore(record, parent)
+        if parent is None:
+            tree = item
+        else:
+            parent.items.append(item)
+        if isfolder(item):
+            folders[record["id"]] = item
+
+    ids = {id(folder): uid for uid, folder in folders.items()}
+    return tree, ids, manifest
+
+
+def load(path: str | Path):
+    tree, _, _ = _load(Path(path))
+    return tree
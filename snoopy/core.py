@@ -1,25 +1,34 @@
 from __future__ import annotations
 
+import collections
+import contextlib
 import copy
+import errno
+import functools
+import heapq
+import importlib.util
+import itertools
 import os
-import sys
+import queue
+import re
+import stat
+import threading
 import time
 import warnings
 from dataclasses import dataclass, field
 from datetime import datetime
 from io import StringIO
 from pathlib import Path
-from typing import Callable, Literal
+from typing import TYPE_CHECKING, Callable, Literal, Sequence, TextIO
 
-from .terminal import Colors, Commands
+from .instrument import DirStats, ScanStats
+from .progress import (CallbackSink, ProgressSink, ScanProgress, TerminalSink,
+                       _ThreadReporter)
 
-try:
-    from rich.console import Console
-
-    _rich_installed_ = True
-except ImportError:
-    _rich_installed_ = False
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
+    from .checkpoint import CheckpointWriter
 
 this_path = Path(__file__).parent
 
@@ -53,14 +62,56 @@ def get_file_size(path: Path):
     return os.path.getsize(path)
 
 
+def _timestamp(ts: float):
+    return datetime.fromtimestamp(ts).replace(microsecond=0)
+
+
+def _counted_bytes(item: Folder | File | Error):
+    # A repeated hard link keeps its size but adds nothing to totals.
+    if iserror(item) or getattr(item, "hardlink", False):
+        return 0
+    return item.bytes
+
+
 class Error(Exception):
-    def __init__(self, *args):
+    def __init__(
+        self,
+        *args,
+        errno: int | None = None,
+        path: Path | None = None,
+        op: str | None = None,
+    ):
         self.args = args
+        self.errno = errno
+        self.path = path
+        self.op = op
         self.when = datetime.now().replace(microsecond=0)
         self.hidden = False
 
+    @classmethod
+    def from_exception(
+        cls,
+        exc: BaseException,
+        *,
+        path: Path | None = None,
+        op: str | None = None,
+    ):
+        # Only plain values are kept; the exception itself would keep its
+        # traceback and every frame on it alive.
+        code = getattr(exc, "errno", None)
+        message = getattr(exc, "strerror", None) or str(exc)
+        if path is None and getattr(exc, "filename", None) is not None:
+            path = Path(os.fsdecode(exc.filename))
+        return cls(type(exc).__name__, message, errno=code, path=path, op=op)
+
     def __str__(self):
-        return f"Error{self.args} [{self.when}]"
+        if self.op is None:
+            return f"Error{self.args} [{self.when}]"
+
+        name, message = self.args
+        if self.errno is not None:
+            message = f"[Errno {self.errno}] {message}"
+        return f"Error({self.op} {self.path}: {name} {message}) [{self.when}]"
 
     def hide(self):
         self.hidden = True
@@ -74,12 +125,36 @@ class File:
     path: Path
 
     def __post_init__(self):
+        self._set_stat(os.stat(self.path))
+
+    @classmethod
+    def from_stat(cls, path: Path, st: os.stat_result):
+        file = cls.__new__(cls)
+        file.path = path
+        file._set_stat(st)
+        return file
+
+    @classmethod
+    def restore(cls, path: Path, **attrs):
+        file = cls.__new__(cls)
+        file.path = path
+        file.name = path.name
+        file.hidden = False
+        file.symlink = False
+        file.hardlink = False
+        file.__dict__.update(attrs)
+        return file
+
+    def _set_stat(self, st: os.stat_result):
         self.name = self.path.name
-        self.bytes = get_file_size(self.path)
-        self.created = get_created(self.path)
-        self.last_access = get_last_access(self.path)
-        self.last_modified = get_last_modified(self.path)
+        self.bytes = st.st_size
+        self.created = _timestamp(st.st_ctime)
+        self.last_access = _timestamp(st.st_atime)
+        self.last_modified = _timestamp(st.st_mtime)
         self.hidden = False
+        # Only an unfollowed link has a link stat; its size is the link's.
+        self.symlink = stat.S_ISLNK(st.st_mode)
+        self.hardlink = False
 
     def __str__(self):
         return (
@@ -104,7 +179,8 @@ class Folder:
 
     @property
     def bytes(self) -> float | int:
-        return sum(getattr(item, "bytes", 0) for item in self.items)
+        items_bytes = sum(_counted_bytes(item) for item in self.items)
+        return items_bytes + self.folded_bytes
 
     @property
     def files(self):
@@ -130,23 +206,119 @@ class Folder:
     def deep_errors(self):
         return self.errors + sum([f.deep_errors for f in self.folders], [])
 
+    @property
+    def num_files(self):
+        return sum(1 for item in self.items if isfile(item)) + self.folded_files
+
+    @property
+    def num_deep_files(self):
+        return self.num_files + sum(f.num_deep_files for f in self.folders)
+
+    @property
+    def num_folders(self):
+        return sum(1 for item in self.items if isfolder(item)) + self.folded_folders
+
+    @property
+    def num_deep_folders(self):
+        return self.num_folders + sum(f.num_deep_folders for f in self.folders)
+
+    @property
+    def complete(self):
+        return not self.incomplete and all(f.complete for f in self.folders)
+
+    @property
+    def newest_modified(self):
+        mtime = self._newest_mtime()
+        return None if mtime is None else _timestamp(mtime)
+
+    def _newest_mtime(self):
+        mtimes = [f.last_modified.timestamp() for f in self.files]
+        mtimes += [f._newest_mtime() for f in self.folders]
+        mtimes.append(self.folded_mtime)
+        return max((m for m in mtimes if m is not None), default=None)
+
     def __post_init__(self):
+        self._set_stat(os.stat(self.path))
+
+    @classmethod
+    def from_stat(cls, path: Path, st: os.stat_result):
+        folder = cls.__new__(cls)
+        folder.path = path
+        folder.items = []
+        folder._set_stat(st)
+        return folder
+
+    @classmethod
+    def restore(cls, path: Path, **attrs):
+        folder = cls.__new__(cls)
+        folder.path = path
+        folder.items = []
+        folder.name = path.name
+        folder.hidden = False
+        folder.folded_bytes = 0
+        folder.folded_files = 0
+        folder.folded_folders = 0
+        folder.folded_mtime = None
+        folder.trimmed_files = 0
+        folder.trimmed_bytes = 0
+        folder.incomplete = False
+        folder.__dict__.update(attrs)
+        return folder
+
+    def _set_stat(self, st: os.stat_result):
         self.name = self.path.name
-        self.created = get_created(self.path)
-        self.last_access = get_last_access(self.path)
-        self.last_modified = get_last_modified(self.path)
+        self.created = _timestamp(st.st_ctime)
+        self.last_access = _timestamp(st.st_atime)
+        self.last_modified = _timestamp(st.st_mtime)
         self.hidden = False
+        self.folded_bytes = 0
+        self.folded_files = 0
+        self.folded_folders = 0
+        self.folded_mtime = None
+        self.trimmed_files = 0
+        self.trimmed_bytes = 0
+        self.incomplete = False
+
+    def fold(self, item: Folder | File | os.stat_result):
+        if isinstance(item, os.stat_result):
+            self.folded_bytes += item.st_size
+            self.folded_files += 1
+            mtime = item.st_mtime
+        elif isfile(item):
+            self.folded_bytes += _counted_bytes(item)
+            self.folded_files += 1
+            mtime = item.last_modified.timestamp()
+        else:
+            self.folded_bytes += item.bytes
+            self.folded_files += item.num_deep_files
+            self.folded_folders += 1 + item.num_deep_folders
+            self.items.extend(item.deep_errors)
+            mtime = item._newest_mtime()
+
+        if mtime is not None and (
+            self.folded_mtime is None or mtime > self.folded_mtime
+        ):
+            self.folded_mtime = mtime
+
+    def trim(self, item: File | os.stat_result):
+        self.fold(item)
+        self.trimmed_files += 1
+        if isinstance(item, os.stat_result):
+            self.trimmed_bytes += item.st_size
+        else:
+            self.trimmed_bytes += _counted_bytes(item)
 
     def __str__(self):
         return (
             f"Folder({self.path}, "
             f"bytes={self.bytes:,d}, "
-            f"files=({len(self.files):,d}/{len(self.deep_files):,d}), "
-            f"folders=({len(self.folders):,d}/{len(self.deep_folders):,d}), "
+            f"files=({self.num_files:,d}/{self.num_deep_files:,d}), "
+            f"folders=({self.num_folders:,d}/{self.num_deep_folders:,d}), "
             f"created={self.created}, "
             f"accessed={self.last_access}, "
             f"modified={self.last_modified}, "
-            f"errors=({len(self.errors):,d}/{len(self.deep_errors):,d}))"
+            f"errors=({len(self.errors):,d}/{len(self.deep_errors):,d})"
+            f"{', incomplete' if self.incomplete else ''})"
         )
 
     def hide(self, deep: bool = True):
@@ -166,132 +338,788 @@ def clone(obj: Folder | File | Error):
     return copy.deepcopy(obj)
 
 
-# fmt: off
-_PROG_BEGIN = Commands.MOVE_UP * 2
-_PROG_ITER = "".join((
-    Commands.MOVE_DOWN * 2,
-    "\n",
-    Colors.BLUE,
-    "Elapsed [sec]: {:.1f} | ",
-    Colors.GREEN,
-    "Folders: {:,d} | ",
-    "Files: {:,d} | ",
-    Colors.RED,
-    "Errors: {:,d}",
-    Colors.DEFAULT,
-    Commands.MOVE_UP,
-    Commands.CLEAR_LINE,
-    Colors.DEFAULT,
-    r"{}",
-))
-_PROG_END = "".join((
-    Commands.MOVE_DOWN,
-    "\n",
-))
-# fmt: on
+def _ignore_nothing(item: Folder | File | Error):
+    return False
+
+
+def _incomplete(tree: Folder):
+    pending = collections.deque([(tree, 0)])
+    while pending:
+        folder, depth = pending.popleft()
+        if folder.incomplete:
+            yield folder, depth
+        pending.extend((sub, depth + 1) for sub in folder.folders)
+
+
+PSEUDO_FS_TYPES = frozenset(
+    (
+        "autofs",
+        "binfmt_misc",
+        "bpf",
+        "cgroup",
+        "cgroup2",
+        "configfs",
+        "debugfs",
+        "devpts",
+        "efivarfs",
+        "fusectl",
+        "hugetlbfs",
+        "mqueue",
+        "nsfs",
+        "proc",
+        "pstore",
+        "rpc_pipefs",
+        "securityfs",
+        "selinuxfs",
+        "sysfs",
+        "tracefs",
+    )
+)
+
+
+def _unescape_mount_point(path: str):
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m[1], 8)), path)
+
+
+def _mounts(mountinfo: str | Path = "/proc/self/mountinfo"):
+    try:
+        with open(mountinfo, encoding="utf-8", errors="replace") as file:
+            lines = file.readlines()
+    except OSError:
+        return []
+
+    mounts = []
+    for line in lines:
+        fields = line.split()
+        try:
+            major, minor = fields[2].split(":")
+            mount_point = _unescape_mount_point(fields[4])
+            fstype = fields[fields.index("-") + 1]
+        except (IndexError, ValueError):
+            continue
+        mounts.append((os.makedev(int(major), int(minor)), mount_point, fstype))
+    return mounts
+
+
+def _all_of(predicates: Sequence[Callable[[os.stat_result], bool]]):
+    if not predicates:
+        return None
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda st: all(predicate(st) for predicate in predicates)
+
+
+def _size_key(st: os.stat_result):
+    return st.st_size
+
+
+def _list_dir(path: Path):
+    with os.scandir(path) as it:
+        return list(it)
+
+
+def _iter_dir(path: Path):
+    with os.scandir(path) as it:
+        yield from it
+
+
+class _Watchdog:
+    # Calls run in daemon threads so that a call hanging on a stale mount
+    # can be abandoned; the thread is replaced and never blocks exit.
+    def __init__(self):
+        self._tasks = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._closed = False
+
+    def run(self, timeout: float, func: Callable, *args):
+        result = queue.SimpleQueue()
+        if not self._idle.acquire(blocking=False):
+            threading.Thread(target=self._work, daemon=True).start()
+        self._tasks.put((result, func, args))
+
+        try:
+            ok, value = result.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError from None
+        if not ok:
+            raise value
+        return value
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            result, func, args = task
+            try:
+                result.put((True, func(*args)))
+            except BaseException as exc:
+                result.put((False, exc))
+            self._idle.release()
+            # A call that hung past close() ends its thread once it returns.
+            if self._closed:
+                return
+
+    def close(self):
+        self._closed = True
+        while self._idle.acquire(blocking=False):
+            self._tasks.put(None)
 
 
 @dataclass
 class Dog:
     name: str = field(default="Snoopy")
     ignore_folder: Callable[[Folder], bool] = field(
-        default=lambda folder: False, kw_only=True
+        default=_ignore_nothing, kw_only=True
     )
     ignore_file: Callable[[File], bool] = field(
-        default=lambda file: False, kw_only=True
+        default=_ignore_nothing, kw_only=True
     )
     ignore_error: Callable[[Error], bool] = field(
-        default=lambda error: False, kw_only=True
+        default=_ignore_nothing, kw_only=True
     )
     raise_on_error: bool = field(default=True, kw_only=True)
     verbosity: Literal[0, 1, 2] = field(default=0, kw_only=True)
+    on_item: Callable[[Folder | File | Error, Folder | None], None] | None = (
+        field(default=None, kw_only=True)
+    )
+    on_done: Callable[[Folder], None] | None = field(default=None, kw_only=True)
+    progress: ProgressSink | Callable[[ScanProgress], None] | None = field(
+        default=None, kw_only=True
+    )
+    progress_interval: float = field(default=0.1, kw_only=True)
+    stats: ScanStats | None = field(default=None, kw_only=True)
+    fold_files: bool = field(default=False, kw_only=True)
+    fold_depth: int | float = field(default=float("inf"), kw_only=True)
+    keep_items: bool = field(default=True, kw_only=True)
+    workers: int = field(default=1, kw_only=True)
+    pool: Executor | None = field(default=None, kw_only=True)
+    one_file_system: bool = field(default=False, kw_only=True)
+    follow_symlinks: bool = field(default=False, kw_only=True)
+    skip_fs_types: frozenset[str] = field(default=PSEUDO_FS_TYPES, kw_only=True)
+    count_links_once: bool = field(default=True, kw_only=True)
+    list_dir: Callable[[Path], list[os.DirEntry]] = field(
+        default=_list_dir, kw_only=True
+    )
+    list_timeout: float | None = field(default=None, kw_only=True)
+    slow_mounts: set[str] = field(default_factory=set, kw_only=True)
+    checkpoint: str | Path | None = field(default=None, kw_only=True)
+    checkpoint_interval: float = field(default=5.0, kw_only=True)
+    match_files: Sequence[Callable[[os.stat_result], bool]] = field(
+        default=(), kw_only=True
+    )
+    top_files: int | None = field(default=None, kw_only=True)
+    top_key: Callable[[os.stat_result], float] = field(
+        default=_size_key, kw_only=True
+    )
 
     def bark(self):
         print("Woof woof! 🐶")
 
-    def snoop(self, path: Path | str | None = None):
+    def snoop(
+        self,
+        path: Path | str | None = None,
+        *,
+        time_budget: float | None = None,
+        max_items: int | None = None,
+    ):
         if path is None:
             path = Path(os.getcwd())
         elif not isinstance(path, Path):
             path = Path(path)
 
-        self.folder_count = 0
-        self.file_count = 0
-        self.error_count = 0
+        if not (path.exists() and path.is_dir()):
+            raise ValueError("path must be an existing directory")
 
-        if self.verbosity >= 1:
-            sys.stdout.write(_PROG_BEGIN)
+        budgeted = time_budget is not None or max_items is not None
+        if budgeted or self.checkpoint is not None:
+            self._check_breadth_first()
 
-        self.tic = time.time()
+        self._start(path)
 
-        tree = self._snoop(path, Folder(path))
+        with self._scanning(path):
+            tree = self._tree = Folder(path)
+            if self.on_item is not None:
+                self.on_item(tree, None)
 
-        if self.verbosity >= 1:
-            sys.stdout.write(_PROG_END)
+            if budgeted or self.checkpoint is not None:
+                tree.incomplete = True
+                self._snoop_breadth_first(
+                    collections.deque([(tree, 0)]),
+                    time_budget,
+                    max_items,
+                    self._checkpoint_writer(tree),
+                )
+            elif self.workers > 1 or self.pool is not None:
+                tree = self._snoop_parallel(path, tree)
+            else:
+                tree = self._snoop(path, tree)
 
         return tree
 
-    def _display(self, item: Error | File | Folder):
-        msg = _PROG_ITER.format(
+    def resume(
+        self,
+        tree: Folder | str | Path,
+        *,
+        time_budget: float | None = None,
+        max_items: int | None = None,
+    ):
+        self._check_breadth_first()
+
+        if isfolder(tree):
+            writer = self._checkpoint_writer(tree)
+        else:
+            from .checkpoint import CheckpointWriter
+
+            tree, writer = CheckpointWriter.open(
+                tree, interval=self.checkpoint_interval
+            )
+
+        # Seen inodes are only known to the dog that started the scan.
+        if tree is not getattr(self, "_tree", None):
+            self._tree = tree
+            self._start(tree.path)
+
+        frontier = collections.deque(_incomplete(tree))
+        with self._scanning(tree.path):
+            self._snoop_breadth_first(frontier, time_budget, max_items, writer)
+        return tree
+
+    def _start(self, path: Path):
+        st = os.stat(path)
+        self._root_dev = st.st_dev
+        self._visited = {(st.st_dev, st.st_ino)}
+        self._links = set()
+
+    def _check_breadth_first(self):
+        if self.workers > 1 or self.pool is not None:
+            raise ValueError("budgets and checkpoints need workers=1")
+        if self.checkpoint is not None and not self.keep_items:
+            raise ValueError("checkpoints need keep_items=True")
+
+    def _checkpoint_writer(self, tree: Folder):
+        if self.checkpoint is None:
+            return None
+
+        from .checkpoint import CheckpointWriter
+
+        return CheckpointWriter.create(
+            self.checkpoint, tree, interval=self.checkpoint_interval
+        )
+
+    @contextlib.contextmanager
+    def _scanning(self, path: Path):
+        self.folder_count = 0
+        self.file_count = 0
+        self.error_count = 0
+        self.current = path
+
+        mounts = []
+        if self.skip_fs_types or self.list_timeout is not None:
+            mounts = _mounts()
+        self._fs_types = {dev: fstype for dev, _, fstype in mounts}
+        self._mount_points = sorted(
+            {mount_point for _, mount_point, _ in mounts}, key=len, reverse=True
+        )
+        self._watchdog = None if self.list_timeout is None else _Watchdog()
+        self._root_mount = self._mount_point(path)
+        self._match_file = _all_of(self.match_files)
+
+        self.tic = time.time()
+
+        reporter = self._reporter()
+        if reporter is not None:
+            reporter.start()
+
+        try:
+            yield
+        finally:
+            if self._watchdog is not None:
+                self._watchdog.close()
+            if reporter is not None:
+                reporter.stop()
+
+    def _reporter(self):
+        sink = self.progress
+        if sink is None and self.verbosity >= 1:
+            sink = TerminalSink()
+        if sink is None:
+            return None
+
+        if not isinstance(sink, ProgressSink):
+            sink = CallbackSink(sink)
+
+        return _ThreadReporter(self._poll, sink, self.progress_interval)
+
+    def _poll(self):
+        return ScanProgress(
             time.time() - self.tic,
             self.folder_count,
             self.file_count,
             self.error_count,
-            item,
+            str(self.current),
         )
-        sys.stdout.write(msg)
 
-    def _snoop(self, path: Path, folder: Folder):
-        if not (path.exists() and path.is_dir()):
-            raise ValueError("path must be an existing directory")
+    def _ignore(self, func: Callable, item, record: DirStats | None):
+        if record is None:
+            return func(item)
 
-        self.folder_count += 1
+        tic = time.perf_counter()
+        try:
+            return func(item)
+        finally:
+            record.ignore_time += time.perf_counter() - tic
+
+    def _stat(self, entry: os.DirEntry, record: DirStats | None):
+        if record is None:
+            return entry.stat(follow_symlinks=self.follow_symlinks)
 
+        tic = time.perf_counter()
         try:
-            for item in path.iterdir():
-                if item.is_dir():
-                    subfolder = Folder(item)
-                    if not self.ignore_folder(subfolder):
-                        folder.items.append(subfolder)
-                        self._snoop(item, subfolder)
+            return entry.stat(follow_symlinks=self.follow_symlinks)
+        finally:
+            record.stat_time += time.perf_counter() - tic
+            record.stats += 1
+
+    def _snoop(self, path: Path, folder: Folder, depth: int = 0):
+        record = self._enter(path)
+        # Under a time budget the stat calls may hang as well, so they are
+        # done together with the listing.
+        prefetch = self.list_timeout is not None
+        try:
+            entries = self._scandir(path, record, prefetch=prefetch)
+            for item, subfolder in self._process(
+                folder, entries, depth, record, prefetched=prefetch
+            ):
+                self._snoop(item, subfolder, depth + 1)
+                if depth >= self.fold_depth:
+                    folder.fold(subfolder)
+        except Exception as exc:
+            self._error(exc, folder, depth, record, path=path, op="scandir")
 
-                elif item.is_file():
-                    self.file_count += 1
+        if depth <= self.fold_depth:
+            self._done(folder, depth, record)
+        return folder
 
-                    file = File(item)
-                    if self.verbosity >= 2:
-                        self._display(file.path)
+    def _snoop_breadth_first(
+        self,
+        frontier: collections.deque[tuple[Folder, int]],
+        time_budget: float | None,
+        max_items: int | None,
+        checkpoint: CheckpointWriter | None = None,
+    ):
+        try:
+            self._breadth_first(frontier, time_budget, max_items, checkpoint)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+    def _breadth_first(
+        self,
+        frontier: collections.deque[tuple[Folder, int]],
+        time_budget: float | None,
+        max_items: int | None,
+        checkpoint: CheckpointWriter | None,
+    ):
+        deadline = float("inf")
+        if time_budget is not None:
+            deadline = time.perf_counter() + time_budget
+        prefetch = self.list_timeout is not None
+
+        while frontier:
+            if time.perf_counter() >= deadline:
+                break
+            if max_items is not None:
+                if self.folder_count + self.file_count >= max_items:
+                    break
+
+            folder, depth = frontier.popleft()
+            folder.incomplete = False
+            record = self._enter(folder.path)
+            try:
+                entries = self._scandir(folder.path, record, prefetch=prefetch)
+                for item, subfolder in self._process(
+                    folder, entries, depth, record, prefetched=prefetch
+                ):
+                    # Folded subtrees are only complete as a whole.
+                    if depth >= self.fold_depth:
+                        self._snoop(item, subfolder, depth + 1)
+                        folder.fold(subfolder)
+                    else:
+                        subfolder.incomplete = True
+                        frontier.append((subfolder, depth + 1))
+            except Exception as exc:
+                self._error(
+                    exc, folder, depth, record, path=folder.path, op="scandir"
+                )
+
+            self._done(folder, depth, record)
+            if checkpoint is not None:
+                checkpoint.listed(folder)
+
+    def _snoop_parallel(self, path: Path, tree: Folder):
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        pending = {}
+        # Folded subfolders are merged into their parent once their whole
+        # subtree is listed; count what is still outstanding per folder.
+        outstanding = {}
+        fold_into = {}
+
+        def submit(path: Path, folder: Folder, depth: int):
+            record = None if self.stats is None else self.stats.add(path)
+            future = pool.submit(self._scandir, path, record, prefetch=True)
+            pending[future] = path, folder, depth, record
+
+        def done(folder: Folder, depth: int, record: DirStats | None):
+            while True:
+                if id(folder) in outstanding:
+                    outstanding[id(folder)] -= 1
+                    if outstanding[id(folder)]:
+                        return
+                    del outstanding[id(folder)]
+
+                parent = fold_into.pop(id(folder), None)
+                if parent is None:
+                    # Only folders that are part of the tree get here.
+                    self._done(folder, depth, record)
+                    return
+                parent.fold(folder)
+                folder, depth, record = parent, depth - 1, None
+
+        if self.pool is None:
+            executor = ThreadPoolExecutor(self.workers)
+        else:
+            # A shared pool is left running for the other scans using it.
+            executor = contextlib.nullcontext(self.pool)
+
+        with executor as pool:
+            submit(path, tree, 0)
+            try:
+                while pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        path, folder, depth, record = pending.pop(future)
+                        self.folder_count += 1
+                        self.current = path
+                        # A folder at fold_depth is final only once all the
+                        # subfolders folded into it are.
+                        if depth >= self.fold_depth:
+                            outstanding.setdefault(id(folder), 1)
+                        try:
+                            entries = future.result()
+                            for item, subfolder in self._process(
+                                folder, entries, depth, record, prefetched=True
+                            ):
+                                if depth >= self.fold_depth:
+                                    outstanding[id(subfolder)] = 1
+                                    fold_into[id(subfolder)] = folder
+                                    if id(folder) in outstanding:
+                                        outstanding[id(folder)] += 1
+                                submit(item, subfolder, depth + 1)
+                        except Exception as exc:
+                            self._error(
+                                exc, folder, depth, record, path=path, op="scandir"
+                            )
+                        done(folder, depth, record)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
 
-                    if not self.ignore_file(file):
-                        folder.items.append(file)
+        return tree
 
+    def _done(self, folder: Folder, depth: int, record: DirStats | None):
+        if self.on_done is None:
+            return
+        try:
+            self.on_done(folder)
         except Exception as exc:
-            self.error_count += 1
+            self._error(exc, folder, depth, record, path=folder.path, op="callback")
 
-            if self.raise_on_error:
-                raise exc
+    def _enter(self, path: Path):
+        self.folder_count += 1
+        self.current = path
+        if self.stats is not None:
+            return self.stats.add(path)
+
+    def _scandir(
+        self,
+        path: Path,
+        record: DirStats | None,
+        *,
+        prefetch: bool = False,
+    ):
+        if self._watchdog is None:
+            # Keeping only the top files saves little if the listing is held
+            # in full, so it is streamed when nothing else needs all of it.
+            streaming = self.top_files is not None and self.list_dir is _list_dir
+            if streaming and record is None and not prefetch:
+                return _iter_dir(path)
+            return self._list(path, record, prefetch)
+
+        # A slow folder on the root's own filesystem is more likely just
+        # large than a sign of a hung mount, so only the folder is skipped.
+        slow = self._mount_point(path)
+        if slow == self._root_mount:
+            slow = os.path.abspath(path)
+        if slow in self.slow_mounts:
+            raise TimeoutError(errno.ETIMEDOUT, f"skipped slow {slow}", str(path))
 
-            error = Error(exc)
-            if self.verbosity >= 1:
-                self._display(error)
+        try:
+            return self._watchdog.run(
+                self.list_timeout, self._list, path, record, prefetch
+            )
+        except TimeoutError:
+            self.slow_mounts.add(slow)
+            raise TimeoutError(
+                errno.ETIMEDOUT,
+                f"listing took longer than {self.list_timeout}s",
+                str(path),
+            ) from None
+
+    def _mount_point(self, path: Path):
+        path = os.path.abspath(path)
+        for mount_point in self._mount_points:
+            if path == mount_point or path.startswith(
+                mount_point.rstrip("/") + "/"
+            ):
+                return mount_point
+        # Without mount information only the folder itself is remembered.
+        return path
+
+    def _list(self, path: Path, record: DirStats | None, prefetch: bool):
+        if record is not None:
+            tic = time.perf_counter()
+
+        entries = self.list_dir(path)
+
+        if record is not None:
+            record.list_time = time.perf_counter() - tic
+            record.entries = len(entries)
+
+        # DirEntry caches its stat result, so workers can do the syscalls
+        # and leave only the bookkeeping to the main thread.
+        if prefetch:
+            for entry in entries:
+                try:
+                    if self._is_dir(entry) or self._is_file(entry):
+                        self._stat(entry, record)
+                except OSError:
+                    pass
+
+        return entries
+
+    def _process(
+        self,
+        folder: Folder,
+        entries: list[os.DirEntry],
+        depth: int,
+        record: DirStats | None,
+        *,
+        prefetched: bool = False,
+    ):
+        # Items of folders below fold_depth never reach the tree, so they
+        # are not announced either.
+        on_item = self.on_item if depth <= self.fold_depth else None
+        fold_subfolders = depth >= self.fold_depth
+        fold_stat = self.ignore_file is _ignore_nothing
+        match_file = self._match_file
+        stat_record = None if prefetched else record
+
+        # Only the top files of a folder are kept, in a min-heap of
+        # (key, -position, file); the others are trimmed into its totals.
+        top_files = self.top_files
+        top = []
+        position = 0
+
+        for entry in entries:
+            item = Path(entry.path)
+            try:
+                is_dir = self._is_dir(entry)
+                if not (is_dir or self._is_file(entry)):
+                    continue
+                st = self._stat(entry, stat_record)
+            except OSError as exc:
+                self._error(exc, folder, depth, record, path=item, op="stat")
+                continue
 
-            if not self.ignore_error(error):
+            # A failing entry is recorded on its own; its siblings are kept.
+            try:
+                if is_dir:
+                    if not self._descend(st):
+                        continue
+
+                    subfolder = Folder.from_stat(item, st)
+                    if self._ignore(self.ignore_folder, subfolder, record):
+                        continue
+
+                    if not fold_subfolders:
+                        if self.keep_items:
+                            folder.items.append(subfolder)
+                        if on_item is not None:
+                            on_item(subfolder, folder)
+                    yield item, subfolder
+                    continue
+
+                self.file_count += 1
+                if self.verbosity >= 2:
+                    self.current = item
+
+                # Files the predicates reject still count towards their
+                # folder, but are checked before a node is made for them.
+                fold = self.fold_files or (
+                    match_file is not None and not match_file(st)
+                )
+                repeated = st.st_nlink > 1 and self._seen_link(st)
+                if fold and fold_stat and not repeated:
+                    folder.fold(st)
+                    continue
+
+                if top_files is not None and not fold:
+                    key = self.top_key(st), -position
+                    position += 1
+                    full = len(top) >= top_files
+                    # Files that cannot make it into the top are not allocated.
+                    if full and fold_stat and not repeated:
+                        if not top or key < top[0][:2]:
+                            folder.trim(st)
+                            continue
+
+                file = File.from_stat(item, st)
+                file.hardlink = repeated
+                if self._ignore(self.ignore_file, file, record):
+                    continue
+
+                if fold:
+                    folder.fold(file)
+                    continue
+
+                if top_files is not None:
+                    if len(top) < top_files:
+                        heapq.heappush(top, (*key, file))
+                    else:
+                        folder.trim(heapq.heappushpop(top, (*key, file))[2])
+                    continue
+
+                if self.keep_items:
+                    folder.items.append(file)
+                if on_item is not None:
+                    on_item(file, folder)
+
+            except Exception as exc:
+                self._error(exc, folder, depth, record, path=item, op="callback")
+
+        # The kept files are added in the order they were listed.
+        for _, _, file in sorted(top, key=lambda kept: kept[1], reverse=True):
+            try:
+                if self.keep_items:
+                    folder.items.append(file)
+                if on_item is not None:
+                    on_item(file, folder)
+            except Exception as exc:
+                self._error(exc, folder, depth, record, path=file.path, op="callback")
+
+    def _is_dir(self, entry: os.DirEntry):
+        return entry.is_dir(follow_symlinks=self.follow_symlinks)
+
+    def _is_file(self, entry: os.DirEntry):
+        # Without following, a link is listed with its own (lstat) size.
+        if self.follow_symlinks:
+            return entry.is_file()
+        return entry.is_file(follow_symlinks=False) or entry.is_symlink()
+
+    def _descend(self, st: os.stat_result):
+        if self.one_file_system and st.st_dev != self._root_dev:
+            return False
+        if self._fs_types.get(st.st_dev) in self.skip_fs_types:
+            return False
+
+        # Bind mounts and followed links can lead back to a folder that
+        # was already seen.
+        key = st.st_dev, st.st_ino
+        if key in self._visited:
+            return False
+        self._visited.add(key)
+        return True
+
+    def _seen_link(self, st: os.stat_result):
+        if not self.count_links_once:
+            return False
+
+        key = st.st_dev, st.st_ino
+        if key in self._links:
+            return True
+        self._links.add(key)
+        return False
+
+    def _error(
+        self,
+        exc: Exception,
+        folder: Folder,
+        depth: int,
+        record: DirStats | None,
+        *,
+        path: Path | None = None,
+        op: str | None = None,
+    ):
+        self.error_count += 1
+        if record is not None:
+            record.errors += 1
+
+        if self.raise_on_error:
+            raise exc
+
+        error = Error.from_exception(exc, path=path, op=op)
+        self.current = error
+
+        if not self._ignore(self.ignore_error, error, record):
+            if self.keep_items:
                 folder.items.append(error)
+            if depth <= self.fold_depth and self.on_item is not None:
+                self.on_item(error, folder)
 
-        if self.verbosity >= 1:
-            self._display(folder.path)
 
-        return folder
+def snoop(
+    path: Path | str | None = None,
+    *,
+    ignore_folder: Callable[[Folder], bool] = _ignore_nothing,
+    ignore_file: Callable[[File], bool] = _ignore_nothing,
+    ignore_error: Callable[[Error], bool] = _ignore_nothing,
+    raise_on_error: bool = True,
+    verbosity: Literal[0, 1, 2] = 0,
+    on_item: Callable[[Folder | File | Error, Folder | None], None] | None = None,
+    progress: ProgressSink | Callable[[ScanProgress], None] | None = None,
+    stats: ScanStats | None = None,
+    workers: int = 1,
+    match_files: Sequence[Callable[[os.stat_result], bool]] = (),
+):
+    return Dog(
+        ignore_folder=ignore_folder,
+        ignore_file=ignore_file,
+        ignore_error=ignore_error,
+        raise_on_error=raise_on_error,
+        verbosity=verbosity,
+        on_item=on_item,
+        progress=progress,
+        stats=stats,
+        workers=workers,
+        match_files=match_files,
+    ).snoop(path)
 
 
-def snoop(
+def du(
     path: Path | str | None = None,
     *,
-    ignore_folder: Callable[[Folder], bool] = lambda folder: False,
-    ignore_file: Callable[[File], bool] = lambda file: False,
-    ignore_error: Callable[[Error], bool] = lambda error: False,
+    depth: int | float = float("inf"),
+    ignore_folder: Callable[[Folder], bool] = _ignore_nothing,
+    ignore_file: Callable[[File], bool] = _ignore_nothing,
+    ignore_error: Callable[[Error], bool] = _ignore_nothing,
     raise_on_error: bool = True,
     verbosity: Literal[0, 1, 2] = 0,
+    progress: ProgressSink | Callable[[ScanProgress], None] | None = None,
+    stats: ScanStats | None = None,
+    workers: int = 1,
 ):
     return Dog(
         ignore_folder=ignore_folder,
@@ -299,18 +1127,25 @@ def snoop(
         ignore_error=ignore_error,
         raise_on_error=raise_on_error,
         verbosity=verbosity,
+        progress=progress,
+        stats=stats,
+        workers=workers,
+        fold_files=True,
+        fold_depth=depth,
     ).snoop(path)
 
 
 @dataclass
 class Transformer:
+    _hooks = ()
+
     def __call__(self, tree: Folder, *, inplace: bool = True):
         if not inplace:
             tree = clone(tree)
 
         self.depth = 0
 
-        tree = self.visit_folder(tree)
+        tree = self._call_visit(self.visit_folder, tree)
         if tree is None:
             return
 
@@ -327,13 +1162,27 @@ class Transformer:
 
     def visit_item(self, item: Folder | File | Error):
         if isfolder(item):
-            return self.visit_folder(item)
+            return self._call_visit(self.visit_folder, item)
         if isfile(item):
-            return self.visit_file(item)
+            return self._call_visit(self.visit_file, item)
         if iserror(item):
-            return self.visit_error(item)
+            return self._call_visit(self.visit_error, item)
         raise TypeError(f"unexpected item of type {type(item)}")
 
+    def _call_visit(self, visit: Callable, item: Folder | File | Error):
+        if not self._hooks:
+            return visit(item)
+
+        for hook in self._hooks:
+            hook.pre_visit(self, visit.__name__, item)
+
+        result = visit(item)
+
+        for hook in reversed(self._hooks):
+            hook.post_visit(self, visit.__name__, item, result)
+
+        return result
+
     def _visit(self, folder: Folder) -> Folder | None:
         self.depth += 1
 
@@ -368,8 +1217,10 @@ def traverse(tree: Folder, reverse: bool = False):
 
 _FOLDER_PREFIX = "📁 "
 _FILE_PREFIX = "📄 "
+_LINK_PREFIX = "🔗 "
 _ERROR_PREFIX = "🤬 "
 _REM_ITEMS_TMPL = "✂️  [Folders: {:,d} | Files: {:,d} | Errors: {:,d}]"
+_TRIMMED_TMPL = " [Trimmed: {:,d} files | {:,d} bytes]"
 
 
 @dataclass
@@ -390,7 +1241,8 @@ class Formatter:
         default=lambda error: str(error), kw_only=True
     )
     prefix_file: Callable[[Formatter, File], str] = field(
-        default=lambda fmt, file: _FILE_PREFIX, kw_only=True
+        default=lambda fmt, file: _LINK_PREFIX if file.symlink else _FILE_PREFIX,
+        kw_only=True,
     )
     prefix_folder: Callable[[Formatter, Folder], str] = field(
         default=lambda fmt, folder: _FOLDER_PREFIX, kw_only=True
@@ -406,31 +1258,75 @@ class Formatter:
         kw_only=True,
     )
     display_remaining: bool = field(default=True, kw_only=True)
+    format_trimmed: Callable[[int, int], str] = field(
+        default=lambda n, b: _TRIMMED_TMPL.format(n, b), kw_only=True
+    )
 
-    def __str__(self):
-        self.buffer = StringIO()
-        if self.max_depth <= 0:
-            return self.buffer.getvalue()
-
-        self.depth = 0
-        self._format(self.tree)
-        return self.buffer.getvalue()
-
-    def _join_append(self, *chunks: str):
-        print("".join(chunks), file=self.buffer)
+    def __post_init__(self):
+        self._collapsed = set()
+        self._index = None
 
-    def _format(self, folder: Folder):
-        self._join_append(
-            self.init_prefix + self.depth * self.indent,
-            self.prefix_folder(self, folder),
-            self.format_folder(folder),
-        )
+    def __str__(self):
+        return "".join(line + "\n" for line in self.iter_lines())
 
-        if self.depth >= self.max_depth:
+    def iter_lines(self):
+        if self.max_depth <= 0:
             return
 
-        self.depth += 1
-
+        self.depth = 0
+        yield from self._format(self.tree)
+
+    def write(self, stream: TextIO, *, buffer_lines: int = 1024):
+        chunk = []
+        for line in self.iter_lines():
+            chunk.append(line)
+            if len(chunk) >= buffer_lines:
+                chunk.append("")
+                stream.write("\n".join(chunk))
+                chunk.clear()
+
+        if chunk:
+            chunk.append("")
+            stream.write("\n".join(chunk))
+
+    def render_range(self, start: int, stop: int):
+        index = self.line_index()
+        start = max(start, 0)
+        if index.root is None:
+            return []
+        stop = min(stop, index.root.rows)
+        if stop <= start:
+            return []
+
+        lines = index.iter_lines(start)
+        return list(itertools.islice(lines, stop - start))
+
+    def num_lines(self):
+        index = self.line_index()
+        return 0 if index.root is None else index.root.rows
+
+    def line_index(self):
+        if self._index is None:
+            self._index = _LineIndex(self)
+        return self._index
+
+    def reindex(self):
+        self._index = None
+
+    def collapse(self, folder: Folder):
+        self._collapsed.add(id(folder))
+        if self._index is not None:
+            self._index.set_collapsed(folder, True)
+
+    def expand(self, folder: Folder):
+        self._collapsed.discard(id(folder))
+        if self._index is not None:
+            self._index.set_collapsed(folder, False)
+
+    def is_collapsed(self, folder: Folder):
+        return id(folder) in self._collapsed
+
+    def _select(self, folder: Folder):
         max_count_table = {
             Folder: self.max_folders_display,
             File: self.max_files_display,
@@ -438,6 +1334,7 @@ class Formatter:
         }
         count_table = {Folder: 0, File: 0, Error: 0}
 
+        selected = []
         for item_count, item in enumerate(folder.items):
             item_type = type(item)
             if item_type not in max_count_table:
@@ -453,47 +1350,216 @@ class Formatter:
                 continue
 
             count_table[item_type] += 1
+            selected.append(item)
 
-            if isfile(item):
-                self._join_append(
-                    self.init_prefix + self.depth * self.indent,
-                    self.prefix_file(self, item),
-                    self.format_file(item),
-                )
-            elif iserror(item):
-                self._join_append(
-                    self.init_prefix + self.depth * self.indent,
-                    self.prefix_error(self, item),
-                    self.format_error(item),
-                )
-            elif isfolder(item):
-                self._format(item)
-
-        if self.display_remaining:
-            remaining = [
-                len(folder.folders) - count_table[Folder],
-                len(folder.files) - count_table[File],
-                len(folder.errors) - count_table[Error],
-            ]
-            if not self.display_hidden:
-                remaining[0] -= sum(1 for i in folder.folders if i.hidden)
-                remaining[1] -= sum(1 for i in folder.files if i.hidden)
-                remaining[2] -= sum(1 for i in folder.errors if i.hidden)
-
-            if any(rem > 0 for rem in remaining):
-                self._join_append(
-                    self.init_prefix + self.depth * self.indent,
-                    self.format_remaining(*remaining),
-                )
+        if not self.display_remaining:
+            return selected, None
+
+        remaining = [
+            len(folder.folders) - count_table[Folder],
+            len(folder.files) - count_table[File] + folder.trimmed_files,
+            len(folder.errors) - count_table[Error],
+        ]
+        if not self.display_hidden:
+            remaining[0] -= sum(1 for i in folder.folders if i.hidden)
+            remaining[1] -= sum(1 for i in folder.files if i.hidden)
+            remaining[2] -= sum(1 for i in folder.errors if i.hidden)
+
+        if not any(rem > 0 for rem in remaining):
+            return selected, None
+
+        return selected, remaining
+
+    def _label(self, item: Folder | File | Error):
+        if isfolder(item):
+            return self.prefix_folder(self, item) + self.format_folder(item)
+        if isfile(item):
+            return self.prefix_file(self, item) + self.format_file(item)
+        return self.prefix_error(self, item) + self.format_error(item)
+
+    def _line(self, depth: int, item: Folder | File | Error):
+        return self.init_prefix + depth * self.indent + self._label(item)
+
+    def _remaining_label(self, remaining: list[int], folder: Folder):
+        label = self.format_remaining(*remaining)
+        if folder.trimmed_files:
+            label += self.format_trimmed(folder.trimmed_files, folder.trimmed_bytes)
+        return label
+
+    def _remaining_line(self, depth: int, remaining: list[int], folder: Folder):
+        indent = self.init_prefix + depth * self.indent
+        return indent + self._remaining_label(remaining, folder)
+
+    def _format(self, folder: Folder):
+        yield self._line(self.depth, folder)
+
+        if self.depth >= self.max_depth or self.is_collapsed(folder):
+            return
+
+        self.depth += 1
+
+        selected, remaining = self._select(folder)
+        for item in selected:
+            if isfolder(item):
+                yield from self._format(item)
+            else:
+                yield self._line(self.depth, item)
+
+        if remaining is not None:
+            yield self._remaining_line(self.depth, remaining, folder)
 
         self.depth -= 1
 
 
+class _Fenwick:
+    def __init__(self, values: list[int]):
+        n = len(values)
+        self.tree = [0] + values
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                self.tree[j] += self.tree[i]
+        self.total = sum(values)
+
+    def add(self, pos: int, delta: int):
+        self.total += delta
+        i = pos + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def search(self, value: int):
+        # Number of leading values whose sum does not exceed value,
+        # together with that sum.
+        pos = acc = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(self.tree) and acc + self.tree[nxt] <= value:
+                pos = nxt
+                acc += self.tree[nxt]
+            step >>= 1
+        return pos, acc
+
+
+class _LineNode:
+    __slots__ = (
+        "folder",
+        "depth",
+        "parent",
+        "slot",
+        "collapsed",
+        "items",
+        "remaining",
+        "children",
+        "sizes",
+        "rows",
+    )
+
+    def __init__(self, folder: Folder, depth: int, parent, slot: int):
+        self.folder = folder
+        self.depth = depth
+        self.parent = parent
+        self.slot = slot
+        self.collapsed = False
+        self.items = None
+        self.remaining = None
+        self.children = {}
+        self.sizes = None
+        self.rows = 1
+
+    def count_rows(self):
+        if self.collapsed or self.items is None:
+            return 1
+        return 1 + self.sizes.total + (self.remaining is not None)
+
+
+class _LineIndex:
+    def __init__(self, fmt: Formatter):
+        self.fmt = fmt
+        self.nodes = {}
+        self.root = None
+        if fmt.max_depth > 0:
+            self.root = self._build(fmt.tree, 0, None, 0)
+
+    def _build(self, folder: Folder, depth: int, parent, slot: int):
+        node = _LineNode(folder, depth, parent, slot)
+        self.nodes[id(folder)] = node
+
+        if depth < self.fmt.max_depth:
+            node.items, node.remaining = self.fmt._select(folder)
+
+            sizes = []
+            for pos, item in enumerate(node.items):
+                if isfolder(item):
+                    child = self._build(item, depth + 1, node, pos)
+                    node.children[pos] = child
+                    sizes.append(child.rows)
+                else:
+                    sizes.append(1)
+            node.sizes = _Fenwick(sizes)
+
+        node.collapsed = self.fmt.is_collapsed(folder)
+        node.rows = node.count_rows()
+        return node
+
+    def set_collapsed(self, folder: Folder, collapsed: bool):
+        node = self.nodes.get(id(folder))
+        if node is None or node.collapsed == collapsed:
+            return
+
+        node.collapsed = collapsed
+        delta = node.count_rows() - node.rows
+        while node is not None and delta:
+            node.rows += delta
+            parent = node.parent
+            if parent is None:
+                break
+
+            parent.sizes.add(node.slot, delta)
+            if parent.collapsed:
+                break
+            node = parent
+
+    def iter_lines(self, start: int = 0):
+        if self.root is not None:
+            yield from self._walk(self.root, start)
+
+    def _walk(self, node: _LineNode, row: int):
+        fmt = self.fmt
+        if row == 0:
+            yield fmt._line(node.depth, node.folder)
+
+        if node.collapsed or node.items is None:
+            return
+
+        pos, acc = node.sizes.search(max(row - 1, 0))
+        offset = max(row - 1, 0) - acc
+        for pos in range(pos, len(node.items)):
+            item = node.items[pos]
+            if isfolder(item):
+                yield from self._walk(node.children[pos], offset)
+            else:
+                yield fmt._line(node.depth + 1, item)
+            offset = 0
+
+        if node.remaining is not None:
+            yield fmt._remaining_line(node.depth + 1, node.remaining, node.folder)
+
+
+# rich is only imported when something is displayed or saved with it.
+@functools.cache
+def _rich_installed():
+    return importlib.util.find_spec("rich") is not None
+
+
 def display(obj: Formatter | str, *, style: str | None = None):
-    if not _rich_installed_:
+    if not _rich_installed():
         warnings.warn("missing package 'rich'; displaying normally")
         return print(obj)
 
+    from rich.console import Console
+
     if style is None:
         style = "bold medium_purple"
 
@@ -505,9 +1571,18 @@ def save_html(
     filename: str | Path,
     *,
     style: str | None = None,
+    native: bool = False,
 ):
-    if not _rich_installed_:
-        raise RuntimeError("failed to save due to missing package 'rich'")
+    if not (native or _rich_installed()):
+        warnings.warn("missing package 'rich'; saving with the native writer")
+        native = True
+
+    if native:
+        from .export import save_html as save_native_html
+
+        return save_native_html(obj, filename)
+
+    from rich.console import Console
 
     if style is None:
         style = "medium_purple"
@@ -519,7 +1594,10 @@ def save_html(
 
 def save_txt(obj: str | Formatter, filename: str | Path):
     with open(filename, mode="w", encoding="utf-8") as file:
-        file.write(str(obj))
+        if isinstance(obj, Formatter):
+            obj.write(file)
+        else:
+            file.write(str(obj))
 
 
 def snapshot(
@@ -527,13 +1605,14 @@ def snapshot(
     filename: str | Path,
     *,
     style: str | None = None,
+    native: bool = False,
     silent: bool = True,
 ):
     if not isinstance(filename, Path):
         filename = Path(filename)
 
     if filename.suffix == ".html":
-        save_html(obj, filename, style=style)
+        save_html(obj, filename, style=style, native=native)
     else:
         save_txt(obj, filename)
 
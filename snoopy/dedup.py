@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .core import File, Folder, isfile, traverse
+from .hashcache import HashCache
+
+_EDGE_BYTES = 64 * 1024
+_BUFFER_BYTES = 1024 * 1024
+_PARTIAL_KIND = "blake2b-160:edges-64k"
+_FULL_KIND = "blake2b-160"
+
+
+def _new_hash():
+    return hashlib.blake2b(digest_size=20)
+
+
+def _partial_digest(path: Path, size: int):
+    digest = _new_hash()
+    with open(path, mode="rb", buffering=0) as file:
+        digest.update(file.read(_EDGE_BYTES))
+        if size > 2 * _EDGE_BYTES:
+            file.seek(-_EDGE_BYTES, os.SEEK_END)
+        digest.update(file.read(_EDGE_BYTES))
+    return digest.hexdigest()
+
+
+def _full_digest(path: Path, size: int):
+    digest = _new_hash()
+    buffer = bytearray(_BUFFER_BYTES)
+    view = memoryview(buffer)
+    with open(path, mode="rb", buffering=0) as file:
+        while n := file.readinto(buffer):
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+@dataclass
+class DuplicateGroup:
+    bytes: int
+    digest: str
+    files: list[File]
+    hardlinks: list[File] = field(default_factory=list)
+
+    @property
+    def reclaimable(self):
+        return self.bytes * (len(self.files) - 1)
+
+
+@dataclass
+class DuplicateReport:
+    groups: list[DuplicateGroup] = field(default_factory=list)
+    errors: list[tuple[Path, Exception]] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def reclaimable(self):
+        return sum(group.reclaimable for group in self.groups)
+
+    @property
+    def num_files(self):
+        return sum(len(group.files) for group in self.groups)
+
+    def report(self, n: int | float = float("inf")):
+        lines = [
+            f"Groups: {len(self.groups):,d} | "
+            f"Files: {self.num_files:,d} | "
+            f"Reclaimable [bytes]: {self.reclaimable:,d} | "
+            f"Errors: {len(self.errors):,d}"
+        ]
+        if self.cache_hits or self.cache_misses:
+            lines[0] += (
+                f" | Cache hits: {self.cache_hits:,d}"
+                f" | Cache misses: {self.cache_misses:,d}"
+            )
+        for count, group in enumerate(self.groups):
+            if count >= n:
+                break
+            lines.append("")
+            lines.append(
+                f"{group.reclaimable:,d} bytes reclaimable "
+                f"({len(group.files)} x {group.bytes:,d} bytes, {group.digest})"
+            )
+            lines += [f"  {file.path}" for file in group.files]
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
+
+
+def _stat(file: File):
+    return os.stat(file.path)
+
+
+def _digests(
+    compute: Callable[[Path, int], str],
+    kind: str,
+    cache: HashCache | None,
+    stats: dict[int, os.stat_result],
+):
+    def digest(file: File):
+        if cache is None:
+            return compute(file.path, file.bytes)
+        return cache.digest(
+            file.path,
+            stats[id(file)],
+            kind,
+            lambda path: compute(path, file.bytes),
+        )
+
+    return digest
+
+
+def _keys(
+    pool: ThreadPoolExecutor,
+    groups: list[list[File]],
+    key: Callable[[File], object],
+    errors: list[tuple[Path, Exception]],
+):
+    def safe_key(file: File):
+        try:
+            return key(file)
+        except OSError as exc:
+            errors.append((file.path, exc))
+            return None
+
+    files = [file for group in groups for file in group]
+    keys = iter(pool.map(safe_key, files))
+    for group in groups:
+        yield group, [next(keys) for _ in group]
+
+
+def _refine(
+    pool: ThreadPoolExecutor,
+    groups: list[list[File]],
+    key: Callable[[File], object],
+    errors: list[tuple[Path, Exception]],
+):
+    refined = []
+    for group, keys in _keys(pool, groups, key, errors):
+        split = defaultdict(list)
+        for file, file_key in zip(group, keys):
+            if file_key is not None:
+                split[file_key].append(file)
+        refined += [(k, g) for k, g in split.items() if len(g) > 1]
+    return refined
+
+
+def duplicates(
+    tree: Folder,
+    *,
+    min_size: int = 1,
+    workers: int | None = None,
+    cache: HashCache | None = None,
+):
+    by_size = defaultdict(list)
+    for item in traverse(tree):
+        # A link's size is that of the link, not of the file it points to.
+        if isfile(item) and not item.symlink and item.bytes >= min_size:
+            by_size[item.bytes].append(item)
+
+    groups = [group for group in by_size.values() if len(group) > 1]
+
+    report = DuplicateReport()
+    hardlinks = defaultdict(list)
+    stats = {}
+
+    if cache is not None:
+        hits, misses = cache.hits, cache.misses
+
+    partial = _digests(_partial_digest, _PARTIAL_KIND, cache, stats)
+    full = _digests(_full_digest, _FULL_KIND, cache, stats)
+
+    with ThreadPoolExecutor(workers) as pool:
+        # Hard links share their inode and are no candidates; only the
+        # first path seen per inode is hashed.
+        candidates = []
+        for group, sts in _keys(pool, groups, _stat, report.errors):
+            unique = {}
+            for file, st in zip(group, sts):
+                if st is None:
+                    continue
+                stats[id(file)] = st
+                inode = st.st_dev, st.st_ino
+                if inode in unique:
+                    hardlinks[id(unique[inode])].append(file)
+                else:
+                    unique[inode] = file
+            if len(unique) > 1:
+                candidates.append(list(unique.values()))
+
+        found = []
+        large = []
+        for digest, group in _refine(pool, candidates, partial, report.errors):
+            # For small files the edges cover the whole content.
+            if group[0].bytes <= 2 * _EDGE_BYTES:
+                found.append((digest, group))
+            else:
+                large.append(group)
+
+        found += _refine(pool, large, full, report.errors)
+
+    if cache is not None:
+        cache.flush()
+        report.cache_hits = cache.hits - hits
+        report.cache_misses = cache.misses - misses
+
+    for digest, group in found:
+        links = [link for file in group for link in hardlinks[id(file)]]
+        report.groups.append(
+            DuplicateGroup(group[0].bytes, digest, group, links)
+        )
+
+    report.groups.sort(key=lambda group: group.reclaimable, reverse=True)
+    return report
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import TextIO
+
+from .core import Error, File, Folder, Formatter, iserror, isfile, isfolder
+
+_HTML_HEAD = """\
+<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<title>{title}</title>
+<style>
+.snoopy {{
+    color: #af87ff;
+    background: #0c0c0c;
+    font-family: Menlo, "DejaVu Sans Mono", Consolas, monospace;
+    font-size: 14px;
+    line-height: 1.4;
+    padding: 1em;
+}}
+.snoopy div,
+.snoopy summary {{ white-space: pre; }}
+.snoopy details details,
+.snoopy details > div {{
+    margin-left: 1.2em;
+    padding-left: 0.6em;
+    border-left: 1px solid #5f5f87;
+}}
+.snoopy summary {{ cursor: pointer; }}
+.snoopy .error {{ color: #ff5f5f; }}
+.snoopy .remaining {{ color: #808080; }}
+</style>
+</head>
+<body>
+<div class="snoopy">
+"""
+
+_HTML_TAIL = """\
+</div>
+</body>
+</html>
+"""
+
+
+def _iter_html(fmt: Formatter, folder: Folder, depth: int, open_depth):
+    label = escape(fmt._label(folder))
+    if depth >= fmt.max_depth:
+        yield f'<div class="folder">{label}</div>\n'
+        return
+
+    is_open = depth < open_depth and not fmt.is_collapsed(folder)
+    yield f"<details{' open' * is_open}><summary>{label}</summary>\n"
+
+    selected, remaining = fmt._select(folder)
+    for item in selected:
+        if isfolder(item):
+            yield from _iter_html(fmt, item, depth + 1, open_depth)
+        else:
+            kind = "file" if isfile(item) else "error"
+            yield f'<div class="{kind}">{escape(fmt._label(item))}</div>\n'
+
+    if remaining is not None:
+        text = escape(fmt._remaining_label(remaining, folder))
+        yield f'<div class="remaining">{text}</div>\n'
+
+    yield "</details>\n"
+
+
+def _iter_text_html(text: str):
+    for line in text.splitlines():
+        yield f"<div>{escape(line)}</div>\n"
+
+
+def write_html(
+    obj: str | Formatter,
+    stream: TextIO,
+    *,
+    title: str | None = None,
+    open_depth: int | float = float("inf"),
+    buffer_chunks: int = 1024,
+):
+    if isinstance(obj, Formatter):
+        pieces = ()
+        if obj.max_depth > 0:
+            pieces = _iter_html(obj, obj.tree, 0, open_depth)
+        if title is None:
+            title = obj.tree.name
+    else:
+        pieces = _iter_text_html(str(obj))
+
+    if title is None:
+        title = "Snoopy"
+
+    stream.write(_HTML_HEAD.format(title=escape(title)))
+
+    chunk = []
+    for piece in pieces:
+        chunk.append(piece)
+        if len(chunk) >= buffer_chunks:
+            stream.write("".join(chunk))
+            chunk.clear()
+    stream.write("".join(chunk))
+
+    stream.write(_HTML_TAIL)
+
+
+def save_html(
+    obj: str | Formatter,
+    filename: str | Path,
+    *,
+    title: str | None = None,
+    open_depth: int | float = float("inf"),
+):
+    with open(filename, mode="w", encoding="utf-8") as file:
+        write_html(obj, file, title=title, open_depth=open_depth)
+
+
+_FOLDED_KEYS = (
+    "folded_bytes",
+    "folded_files",
+    "folded_folders",
+    "folded_mtime",
+    "trimmed_files",
+    "trimmed_bytes",
+)
+
+
+# Folders are streamed as soon as they are found; their folded counters
+# follow in a "done" record once they are final.
+def _done(folder: Folder, uid: int):
+    record = {"id": uid, "kind": "done"}
+    for key in _FOLDED_KEYS:
+        if getattr(folder, key):
+            record[key] = getattr(folder, key)
+    return record
+
+
+def _apply_done(folder: Folder, record: dict):
+    for key in _FOLDED_KEYS:
+        if key in record:
+            setattr(folder, key, record[key])
+
+
+def _record(item: Folder | File | Error, uid: int, parent: int | None):
+    record = {"id": uid, "parent": parent}
+    if iserror(item):
+        record["kind"] = "error"
+        record["args"] = [str(arg) for arg in item.args]
+        for key in ("errno", "op"):
+            if getattr(item, key) is not None:
+                record[key] = getattr(item, key)
+        if item.path is not None:
+            record["path"] = str(item.path)
+        record["when"] = item.when.isoformat()
+        record["hidden"] = item.hidden
+        return record
+
+    record["kind"] = "folder" if isfolder(item) else "file"
+    if parent is None:
+        record["path"] = str(item.path)
+    else:
+        record["name"] = item.name
+    if isfile(item):
+        record["bytes"] = item.bytes
+        for key in ("symlink", "hardlink"):
+            if getattr(item, key):
+                record[key] = True
+    else:
+        for key in _FOLDED_KEYS:
+            if getattr(item, key):
+                record[key] = getattr(item, key)
+        if item.incomplete:
+            record["incomplete"] = True
+    record["created"] = item.created.isoformat()
+    record["last_access"] = item.last_access.isoformat()
+    record["last_modified"] = item.last_modified.isoformat()
+    record["hidden"] = item.hidden
+    return record
+
+
+def _restore(record: dict, parent: Folder | None):
+    if record["kind"] == "error":
+        path = record.get("path")
+        error = Error(
+            *record["args"],
+            errno=record.get("errno"),
+            path=None if path is None else Path(path),
+            op=record.get("op"),
+        )
+        error.when = datetime.fromisoformat(record["when"])
+        error.hidden = record["hidden"]
+        return error
+
+    if parent is None:
+        path = Path(record["path"])
+    else:
+        path = parent.path / record["name"]
+
+    times = {
+        key: datetime.fromisoformat(record[key])
+        for key in ("created", "last_access", "last_modified")
+    }
+
+    # restore() does not stat the (possibly absent) path.
+    if record["kind"] == "folder":
+        folded = {key: record[key] for key in _FOLDED_KEYS if key in record}
+        item = Folder.restore(path, **times, **folded)
+        item.incomplete = record.get("incomplete", False)
+    else:
+        item = File.restore(
+            path,
+            bytes=record["bytes"],
+            symlink=record.get("symlink", False),
+            hardlink=record.get("hardlink", False),
+            **times,
+        )
+    item.hidden = record["hidden"]
+    return item
+
+
+class JsonWriter:
+    def __init__(self, fp: TextIO, *, ndjson: bool = True):
+        self.fp = fp
+        self.ndjson = ndjson
+        self.count = 0
+        self.written = False
+        self.uids = {}
+
+        if not self.ndjson:
+            self.fp.write("[\n")
+
+    def __call__(self, item: Folder | File | Error, parent: Folder | None):
+        uid = self.count
+        self.count += 1
+
+        if isfolder(item):
+            self.uids[id(item)] = uid
+
+        parent_uid = None if parent is None else self.uids[id(parent)]
+        self._write(_record(item, uid, parent_uid))
+
+    def done(self, folder: Folder):
+        record = _done(folder, self.uids[id(folder)])
+        # Nothing was folded into most folders.
+        if len(record) > 2:
+            self._write(record)
+
+    def _write(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        if not self.ndjson and self.written:
+            line = "," + line
+        self.written = True
+        self.fp.write(line + "\n")
+
+    def close(self):
+        if not self.ndjson:
+            self.fp.write("]\n")
+        self.fp.flush()
+
+
+def _iter_with_parent(tree: Folder):
+    stack = [tree]
+    while stack:
+        folder = stack.pop()
+        for item in folder.items:
+            yield item, folder
+            if isfolder(item):
+                stack.append(item)
+
+
+def export_json(tree: Folder, fp: TextIO, *, ndjson: bool = True):
+    writer = JsonWriter(fp, ndjson=ndjson)
+    writer(tree, None)
+    for item, parent in _iter_with_parent(tree):
+        writer(item, parent)
+    writer.close()
+
+
+def iter_records(fp: TextIO):
+    for line in fp:
+        line = line.strip().lstrip(",")
+        if line and line not in ("[", "]"):
+            yield json.loads(line)
+
+
+def load_json(fp: TextIO):
+    root = None
+    folders = {}
+    for record in iter_records(fp):
+        if record["kind"] == "done":
+            _apply_done(folders[record["id"]], record)
+            continue
+
+        parent = folders.get(record["parent"])
+        item = _restore(record, parent)
+
+        if parent is None:
+            root = item
+        else:
+            parent.items.append(item)
+
+        if isfolder(item):
+            folders[record["id"]] = item
+
+    return root
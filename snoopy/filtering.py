@@ -1,4 +1,5 @@
 import fnmatch
+import functools
 import re
 from dataclasses import dataclass
 from pathlib import Path
@@ -44,13 +45,9 @@ class Pattern:
 
     @classmethod
     def from_gitignore(cls, path: str | Path):
-        patterns = []
-        for line in Path(path).read_text().splitlines():
-            if line and (not line.startswith("#")):
-                patterns.append(line)
-
-        root = Path(path).resolve().parent
-        return cls(*patterns, root=root)
+        path = Path(path).resolve()
+        patterns = _read_gitignore(path, path.stat().st_mtime_ns)
+        return cls(*patterns, root=path.parent)
 
     def __call__(self, item: File | Folder):
         path = item.path
@@ -70,6 +67,16 @@ class Pattern:
         return False
 
 
+# Scans of many roots often load the same files again.
+@functools.lru_cache(maxsize=256)
+def _read_gitignore(path: Path, mtime_ns: int):
+    patterns = []
+    for line in path.read_text().splitlines():
+        if line and (not line.startswith("#")):
+            patterns.append(line)
+    return tuple(patterns)
+
+
 class GitIgnore:
     def __new__(self, path: str | Path):
         return Pattern.from_gitignore(path)
@@ -5,6 +5,7 @@ from .core import Error, File, Folder, clone
 from .units import Converter
 
 
+@dataclass
 class ItemSize:
     unit: Literal["B", "KB", "MB", "GB", "TB"] = field(default="B")
 
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS digests (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (dev, ino, kind)
+) WITHOUT ROWID
+"""
+
+_SELECT = """\
+SELECT digest FROM digests
+WHERE dev = ? AND ino = ? AND kind = ? AND size = ? AND mtime_ns = ?
+"""
+
+_UPSERT = """\
+INSERT OR REPLACE INTO digests (dev, ino, kind, size, mtime_ns, digest, path)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def default_path():
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home is None:
+        cache_home = Path.home() / ".cache"
+    return Path(cache_home) / "snoopy" / "hashes.sqlite3"
+
+
+class HashCache:
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        timeout: float = 60.0,
+        batch_size: int = 512,
+    ):
+        if path is None:
+            path = default_path()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._pending = []
+        # WAL lets readers in other processes proceed while one writes;
+        # the busy timeout makes concurrent writers wait for each other.
+        self._conn = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    def get(self, st: os.stat_result, kind: str):
+        key = (st.st_dev, st.st_ino, kind, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            row = self._conn.execute(_SELECT, key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, st: os.stat_result, kind: str, digest: str, path: Path):
+        row = (
+            st.st_dev,
+            st.st_ino,
+            kind,
+            st.st_size,
+            st.st_mtime_ns,
+            digest,
+            str(path),
+        )
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def digest(
+        self,
+        path: Path,
+        st: os.stat_result,
+        kind: str,
+        compute: Callable[[Path], str],
+    ):
+        digest = self.get(st, kind)
+        if digest is None:
+            digest = compute(path)
+            self.put(st, kind, digest, path)
+        return digest
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            with self._conn:
+                self._conn.executemany(_UPSERT, self._pending)
+            self._pending.clear()
+
+    def evict(self):
+        self.flush()
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dev, ino, kind, size, mtime_ns, path FROM digests"
+            ).fetchall()
+
+        stale = []
+        for dev, ino, kind, size, mtime_ns, path in rows:
+            try:
+                st = os.stat(path)
+            except OSError:
+                stale.append((dev, ino, kind))
+                continue
+            current = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            if current != (dev, ino, size, mtime_ns):
+                stale.append((dev, ino, kind))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM digests WHERE dev = ? AND ino = ? AND kind = ?",
+                stale,
+            )
+        return len(stale)
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM digests").fetchone()
+            return row[0]
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
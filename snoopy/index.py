@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from .core import Dog, Error, File, Folder, _counted_bytes, iserror, isfolder
+from .export import _iter_with_parent
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    parent INTEGER,
+    kind TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ext TEXT,
+    size INTEGER,
+    folded_bytes INTEGER NOT NULL DEFAULT 0,
+    folded_files INTEGER NOT NULL DEFAULT 0,
+    folded_folders INTEGER NOT NULL DEFAULT 0,
+    created REAL,
+    last_access REAL,
+    last_modified REAL,
+    hardlink INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+# Created after the bulk insert; maintaining them row by row is slower.
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS nodes_parent ON nodes (parent)",
+    "CREATE INDEX IF NOT EXISTS nodes_path ON nodes (path)",
+    "CREATE INDEX IF NOT EXISTS nodes_ext_size ON nodes (kind, ext, size)",
+    "CREATE INDEX IF NOT EXISTS nodes_size ON nodes (kind, size)",
+    "CREATE INDEX IF NOT EXISTS nodes_modified ON nodes (kind, last_modified)",
+)
+
+_INSERT = """\
+INSERT INTO nodes (
+    id, parent, kind, depth, path, name, ext, size,
+    folded_bytes, folded_files, folded_folders,
+    created, last_access, last_modified, hardlink
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPDATE = """\
+UPDATE nodes SET size = ?, folded_bytes = ?, folded_files = ?, folded_folders = ?
+WHERE id = ?
+"""
+
+_COLUMNS = (
+    "id, parent, kind, depth, path, name, ext, size, "
+    "folded_bytes, folded_files, folded_folders, "
+    "created, last_access, last_modified, hardlink"
+)
+
+
+@dataclass(slots=True)
+class Record:
+    id: int
+    parent: int | None
+    kind: str
+    depth: int
+    path: str
+    name: str
+    ext: str | None
+    size: int | None
+    folded_bytes: int
+    folded_files: int
+    folded_folders: int
+    created: float | None
+    last_access: float | None
+    last_modified: float | None
+    hardlink: int
+
+
+def _connect(db_path: str | Path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with conn:
+        conn.execute(_SCHEMA)
+    return conn
+
+
+def _timestamp(dt: datetime | None):
+    return None if dt is None else dt.timestamp()
+
+
+def _glob_escape(path: str):
+    return re.sub(r"([*?[])", r"[\1]", path)
+
+
+class _OpenFolder:
+    # A folder row is written when the folder is found; its size follows
+    # once its own listing and those of all its subfolders are done. The
+    # folder is referenced until then, so that its id() is not reused.
+    __slots__ = ("folder", "uid", "depth", "parent", "bytes", "folded", "pending")
+
+    def __init__(
+        self, folder: Folder, uid: int, depth: int, parent: _OpenFolder | None
+    ):
+        self.folder = folder
+        self.uid = uid
+        self.depth = depth
+        self.parent = parent
+        self.bytes = 0
+        self.folded = (0, 0, 0)
+        self.pending = 1
+
+
+class IndexWriter:
+    def __init__(self, conn: sqlite3.Connection, *, batch_size: int = 10_000):
+        self.conn = conn
+        self.batch_size = batch_size
+        row = conn.execute("SELECT MAX(id) FROM nodes").fetchone()
+        self.next_id = (row[0] or 0) + 1
+        self.folders = {}
+        self.rows = []
+        self.updates = []
+
+    def __call__(self, item: Folder | File | Error, parent: Folder | None):
+        uid = self.next_id
+        self.next_id += 1
+
+        if parent is None:
+            node, parent_uid, depth = None, None, 0
+        else:
+            node = self.folders[id(parent)]
+            parent_uid, depth = node.uid, node.depth + 1
+
+        if isfolder(item):
+            self.folders[id(item)] = _OpenFolder(item, uid, depth, node)
+            if node is not None:
+                node.pending += 1
+        elif node is not None:
+            node.bytes += _counted_bytes(item)
+
+        if iserror(item):
+            if item.path is not None:
+                path = str(item.path)
+            else:
+                path = "" if parent is None else str(parent.path)
+            row = (uid, parent_uid, "error", depth, path, str(item))
+            row += (None, None, 0, 0, 0, None, None, None, False)
+        else:
+            kind = "folder" if isfolder(item) else "file"
+            ext = None if isfolder(item) else item.path.suffix.lower()
+            size = None if isfolder(item) else item.bytes
+            row = (uid, parent_uid, kind, depth, str(item.path), item.name)
+            row += (
+                ext,
+                size,
+                getattr(item, "folded_bytes", 0),
+                getattr(item, "folded_files", 0),
+                getattr(item, "folded_folders", 0),
+            )
+            row += (
+                _timestamp(item.created),
+                _timestamp(item.last_access),
+                _timestamp(item.last_modified),
+                getattr(item, "hardlink", False),
+            )
+
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def done(self, folder: Folder):
+        node = self.folders[id(folder)]
+        node.bytes += folder.folded_bytes
+        node.folded = (
+            folder.folded_bytes,
+            folder.folded_files,
+            folder.folded_folders,
+        )
+        node.pending -= 1
+        self._settle(node)
+
+    def _settle(self, node: _OpenFolder):
+        while node.pending == 0:
+            del self.folders[id(node.folder)]
+            node.folder = None
+            self.updates.append((node.bytes, *node.folded, node.uid))
+            if node.parent is None:
+                break
+            node.parent.bytes += node.bytes
+            node.parent.pending -= 1
+            node = node.parent
+
+        if len(self.updates) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows or self.updates:
+            with self.conn:
+                self.conn.executemany(_INSERT, self.rows)
+                self.conn.executemany(_UPDATE, self.updates)
+            self.rows.clear()
+            self.updates.clear()
+
+    def close(self):
+        # Folders of an interrupted scan keep what was found of them.
+        for node in sorted(self.folders.values(), key=lambda n: -n.depth):
+            if node.folder is not None:
+                node.pending = 0
+                self._settle(node)
+
+        self.flush()
+        with self.conn:
+            for statement in _INDEXES:
+                self.conn.execute(statement)
+            self.conn.execute("ANALYZE")
+
+
+def build(
+    source: Folder | Path | str,
+    db_path: str | Path,
+    *,
+    dog: Dog | None = None,
+    batch_size: int = 10_000,
+):
+    conn = _connect(db_path)
+    # A build replaces the previous one; the indexes go with the table and
+    # are created again once the rows are in.
+    with conn:
+        conn.execute("DROP TABLE nodes")
+        conn.execute(_SCHEMA)
+    writer = IndexWriter(conn, batch_size=batch_size)
+
+    if isfolder(source):
+        writer(source, None)
+        folders = [source]
+        for item, parent in _iter_with_parent(source):
+            writer(item, parent)
+            if isfolder(item):
+                folders.append(item)
+        for folder in folders:
+            writer.done(folder)
+    else:
+        # Scan straight into the index; the tree is never kept.
+        if dog is None:
+            dog = Dog()
+        saved = dog.on_item, dog.on_done, dog.keep_items
+        dog.on_item, dog.on_done, dog.keep_items = writer, writer.done, False
+        try:
+            dog.snoop(source)
+        finally:
+            dog.on_item, dog.on_done, dog.keep_items = saved
+
+    writer.close()
+    return Index(db_path, conn=conn)
+
+
+class Index:
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        conn: sqlite3.Connection | None = None,
+    ):
+        self.db_path = db_path
+        self.conn = conn if conn is not None else _connect(db_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def query(
+        self,
+        *,
+        kind: str | None = "file",
+        name: str | None = None,
+        under: str | Path | None = None,
+        path_glob: str | None = None,
+        ext: str | None = None,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        modified_before: datetime | float | None = None,
+        modified_after: datetime | float | None = None,
+        where: str | None = None,
+        params: tuple = (),
+        order_by: str | None = None,
+        limit: int | None = None,
+    ) -> Iterator[Record]:
+        clauses, args = [], []
+
+        def add(clause: str, *values):
+            clauses.append(clause)
+            args.extend(values)
+
+        if kind is not None:
+            add("kind = ?", kind)
+        if name is not None:
+            add("name GLOB ?", name)
+        if under is not None:
+            add("path GLOB ?", _glob_escape(str(under).rstrip("/")) + "/*")
+        if path_glob is not None:
+            add("path GLOB ?", path_glob)
+        if ext is not None:
+            add("ext = ?", "." + ext.lower().lstrip("."))
+        if min_size is not None:
+            add("size >= ?", min_size)
+        if max_size is not None:
+            add("size <= ?", max_size)
+        if modified_before is not None:
+            if isinstance(modified_before, datetime):
+                modified_before = modified_before.timestamp()
+            add("last_modified < ?", modified_before)
+        if modified_after is not None:
+            if isinstance(modified_after, datetime):
+                modified_after = modified_after.timestamp()
+            add("last_modified >= ?", modified_after)
+        if where is not None:
+            add(f"({where})", *params)
+
+        sql = f"SELECT {_COLUMNS} FROM nodes"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by is not None:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        for row in self.conn.execute(sql, args):
+            yield Record(*row)
+
+    def subtree(self, path: str | Path):
+        row = self.conn.execute(
+            f"SELECT {_COLUMNS} FROM nodes WHERE path = ? AND kind = 'folder'",
+            (str(path),),
+        ).fetchone()
+        if row is None:
+            return None
+
+        root = Record(*row)
+        rows = self.conn.execute(
+            f"""
+            WITH RECURSIVE sub(id) AS (
+                SELECT ?
+                UNION ALL
+                SELECT nodes.id FROM nodes JOIN sub ON nodes.parent = sub.id
+            )
+            SELECT {_COLUMNS} FROM nodes WHERE id IN (SELECT id FROM sub)
+            ORDER BY id
+            """,
+            (root.id,),
+        )
+
+        folders = {}
+        tree = None
+        for row in rows:
+            record = Record(*row)
+            item = _restore(record)
+            if record.id == root.id:
+                tree = item
+            else:
+                folders[record.parent].items.append(item)
+            if isfolder(item):
+                folders[record.id] = item
+        return tree
+
+
+def _datetime(ts: float | None):
+    return None if ts is None else datetime.fromtimestamp(ts)
+
+
+def _restore(record: Record):
+    if record.kind == "error":
+        return Error(record.name)
+
+    times = {
+        "created": _datetime(record.created),
+        "last_access": _datetime(record.last_access),
+        "last_modified": _datetime(record.last_modified),
+    }
+    if record.kind == "folder":
+        return Folder.restore(
+            Path(record.path),
+            folded_bytes=record.folded_bytes,
+            folded_files=record.folded_files,
+            folded_folders=record.folded_folders,
+            **times,
+        )
+    return File.restore(
+        Path(record.path),
+        bytes=record.size,
+        hardlink=bool(record.hardlink),
+        **times,
+    )
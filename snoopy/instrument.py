@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+from dataclasses import dataclass, field
+from pathlib import Path
+
+_LATENCY_EDGES = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1e0, 1e1)
+
+
+def _format_seconds(value: float):
+    if value == float("inf"):
+        return "inf"
+    if value < 1e-3:
+        return f"{value * 1e6:.0f}us"
+    if value < 1:
+        return f"{value * 1e3:.0f}ms"
+    return f"{value:.0f}s"
+
+
+@dataclass(slots=True)
+class DirStats:
+    path: Path
+    list_time: float = 0.0
+    stat_time: float = 0.0
+    ignore_time: float = 0.0
+    entries: int = 0
+    stats: int = 0
+    errors: int = 0
+
+    @property
+    def total_time(self):
+        return self.list_time + self.stat_time + self.ignore_time
+
+
+@dataclass
+class ScanStats:
+    directories: list[DirStats] = field(default_factory=list)
+
+    def add(self, path: Path):
+        record = DirStats(path)
+        self.directories.append(record)
+        return record
+
+    @property
+    def list_time(self):
+        return sum(d.list_time for d in self.directories)
+
+    @property
+    def stat_time(self):
+        return sum(d.stat_time for d in self.directories)
+
+    @property
+    def ignore_time(self):
+        return sum(d.ignore_time for d in self.directories)
+
+    @property
+    def entries(self):
+        return sum(d.entries for d in self.directories)
+
+    @property
+    def stats(self):
+        return sum(d.stats for d in self.directories)
+
+    @property
+    def errors(self):
+        return sum(d.errors for d in self.directories)
+
+    def slowest(self, n: int = 10, *, key: str = "list_time"):
+        return heapq.nlargest(
+            n, self.directories, key=lambda d: getattr(d, key)
+        )
+
+    def histogram(self):
+        counts = [0] * (len(_LATENCY_EDGES) + 1)
+        for record in self.directories:
+            counts[bisect.bisect(_LATENCY_EDGES, record.list_time)] += 1
+
+        edges = (0.0,) + _LATENCY_EDGES + (float("inf"),)
+        return list(zip(edges[:-1], edges[1:], counts))
+
+    def report(self, n: int = 10):
+        lines = [
+            f"Directories: {len(self.directories):,d} | "
+            f"Entries: {self.entries:,d} | "
+            f"Stats: {self.stats:,d} | "
+            f"Errors: {self.errors:,d}",
+            f"List [sec]: {self.list_time:.3f} | "
+            f"Stat [sec]: {self.stat_time:.3f} | "
+            f"Ignore [sec]: {self.ignore_time:.3f}",
+            "",
+            "List latency:",
+        ]
+
+        width = max([c for *_, c in self.histogram()] + [1])
+        for lo, hi, count in self.histogram():
+            label = f"{_format_seconds(lo):>6} - {_format_seconds(hi):<6}"
+            bar = "#" * round(40 * count / width)
+            lines.append(f"  {label} {count:>10,d} {bar}")
+
+        lines += ["", f"Slowest {n} directories:"]
+        for record in self.slowest(n):
+            lines.append(
+                f"  {record.list_time * 1e3:10.3f} ms "
+                f"{record.entries:>10,d} entries  {record.path}"
+            )
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
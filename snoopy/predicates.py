@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import operator
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Literal
+
+from . import units
+from .pruning import _ops_map, _parse_size_cmp
+
+StatPredicate = Callable[[os.stat_result], bool]
+
+_fields = {
+    "size": "st_size",
+    "mtime": "st_mtime",
+    "atime": "st_atime",
+    "ctime": "st_ctime",
+    "nlink": "st_nlink",
+    "uid": "st_uid",
+    "gid": "st_gid",
+}
+
+
+@dataclass
+class Stat:
+    field: Literal["size", "mtime", "atime", "ctime", "nlink", "uid", "gid"]
+    operator: Literal["==", "!=", ">", ">=", "<", "<="]
+    value: float | int
+
+    def __post_init__(self):
+        if self.field not in _fields:
+            raise ValueError(f"unknown stat field '{self.field}'")
+        if self.operator not in _ops_map:
+            raise ValueError(f"unknown operator '{self.operator}'")
+
+        self.get = operator.attrgetter(_fields[self.field])
+        self.cmp = _ops_map[self.operator]
+
+    def __call__(self, st: os.stat_result):
+        return self.cmp(self.get(st), self.value)
+
+
+def size(expr: str):
+    op, value, unit = _parse_size_cmp(expr)
+    return Stat("size", op, units.to_bytes(value, unit))
+
+
+def _timestamp(when: datetime | timedelta | float):
+    # A timedelta is counted back from now.
+    if isinstance(when, timedelta):
+        return time.time() - when.total_seconds()
+    if isinstance(when, datetime):
+        return when.timestamp()
+    return when
+
+
+def modified_after(when: datetime | timedelta | float):
+    return Stat("mtime", ">=", _timestamp(when))
+
+
+def modified_before(when: datetime | timedelta | float):
+    return Stat("mtime", "<", _timestamp(when))
+
+
+def all_of(*predicates: StatPredicate):
+    def all_predicates(st: os.stat_result) -> bool:
+        return all(predicate(st) for predicate in predicates)
+
+    return all_predicates
+
+
+def any_of(*predicates: StatPredicate):
+    def any_predicates(st: os.stat_result) -> bool:
+        return any(predicate(st) for predicate in predicates)
+
+    return any_predicates
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import contextlib
+import marshal
+import pstats
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from .core import Error, File, Folder, Transformer
+
+
+class TransformerHook:
+    def pre_visit(
+        self,
+        transformer: Transformer,
+        name: str,
+        item: Folder | File | Error,
+    ):
+        pass
+
+    def post_visit(
+        self,
+        transformer: Transformer,
+        name: str,
+        item: Folder | File | Error,
+        result: Any,
+    ):
+        pass
+
+
+def add_hook(
+    target: Transformer | type[Transformer],
+    hook: TransformerHook,
+):
+    target._hooks = (*target._hooks, hook)
+
+
+def remove_hook(
+    target: Transformer | type[Transformer],
+    hook: TransformerHook,
+):
+    target._hooks = tuple(h for h in target._hooks if h is not hook)
+
+
+@dataclass(slots=True)
+class VisitStats:
+    calls: int = 0
+    tottime: float = 0.0
+    cumtime: float = 0.0
+
+
+def _function_key(transformer: Transformer, name: str):
+    func = getattr(type(transformer), name)
+    code = func.__code__
+    return code.co_filename, code.co_firstlineno, func.__qualname__
+
+
+class TransformerProfile(TransformerHook):
+    def __init__(self, timer: Callable[[], float] = time.perf_counter):
+        self.timer = timer
+        self.methods = defaultdict(VisitStats)
+        self.depths = defaultdict(VisitStats)
+        self._keys = {}
+        self._stack = []
+
+    def pre_visit(self, transformer, name, item):
+        self._stack.append([self.timer(), 0.0])
+
+    def post_visit(self, transformer, name, item, result):
+        start, inner = self._stack.pop()
+        elapsed = self.timer() - start
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+        cache_key = (type(transformer), name)
+        key = self._keys.get(cache_key)
+        if key is None:
+            key = self._keys[cache_key] = _function_key(transformer, name)
+
+        for stats in (
+            self.methods[key],
+            self.depths[key[2], transformer.depth],
+        ):
+            stats.calls += 1
+            stats.tottime += elapsed - inner
+            stats.cumtime += elapsed
+
+    def create_stats(self):
+        self.stats = {
+            key: (s.calls, s.calls, s.tottime, s.cumtime, {})
+            for key, s in self.methods.items()
+        }
+
+    def to_pstats(self):
+        return pstats.Stats(self)
+
+    def dump_stats(self, filename: str | Path):
+        self.create_stats()
+        with open(filename, mode="wb") as file:
+            marshal.dump(self.stats, file)
+
+    def report(self):
+        lines = [f"{'calls':>10} {'tottime':>10} {'cumtime':>10}  method"]
+        methods = sorted(
+            self.methods.items(), key=lambda kv: kv[1].cumtime, reverse=True
+        )
+        for (_, _, name), s in methods:
+            lines.append(
+                f"{s.calls:>10,d} {s.tottime:>10.4f} {s.cumtime:>10.4f}  {name}"
+            )
+
+        lines += ["", f"{'depth':>10} {'calls':>10} {'cumtime':>10}  method"]
+        depths = sorted(self.depths.items(), key=lambda kv: kv[0][1])
+        for (name, depth), s in depths:
+            lines.append(
+                f"{depth:>10,d} {s.calls:>10,d} {s.cumtime:>10.4f}  {name}"
+            )
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
+
+
+@contextlib.contextmanager
+def profile(target: Transformer | type[Transformer] = Transformer):
+    prof = TransformerProfile()
+    add_hook(target, prof)
+    try:
+        yield prof
+    finally:
+        remove_hook(target, prof)
@@ -1,10 +1,13 @@
+import functools
+import logging
 import shutil
 import sys
 import threading
 import time
 from dataclasses import dataclass, field
+from typing import Callable
 
-from .terminal import Commands
+from .terminal import Colors, Commands
 
 elapsed_template = "Elapsed [sec]: {:.1f}\r"
 
@@ -40,7 +43,16 @@ def make_dog_template(niter: int):
     return tuple(dog_string(n) for n in range(0, stop, stop // niter))
 
 
-dog_template = make_dog_template(niter=30)
+# Built on first use; it depends on the terminal size at that time.
+@functools.cache
+def _dog_template():
+    return make_dog_template(niter=30)
+
+
+def __getattr__(name: str):
+    if name == "dog_template":
+        return _dog_template()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class _ProgressTemplate:
@@ -110,7 +122,7 @@ class _Progress:
 
 
 def dog(time_sleep: float = 0.15):
-    return _Progress(dog_template, time_sleep=time_sleep)
+    return _Progress(_dog_template(), time_sleep=time_sleep)
 
 
 def elapsed(time_sleep: float = 0.1):
@@ -123,3 +135,125 @@ def dots(time_sleep: float = 0.35):
 
 def rotate(time_sleep: float = 0.35):
     return _Progress(rotate_template, time_sleep=time_sleep)
+
+
+@dataclass
+class ScanProgress:
+    elapsed: float
+    folders: int
+    files: int
+    errors: int
+    current: str = ""
+
+
+class ProgressSink:
+    def start(self):
+        pass
+
+    def update(self, progress: ScanProgress):
+        pass
+
+    def stop(self):
+        pass
+
+
+# fmt: off
+_SCAN_BEGIN = Commands.MOVE_UP * 2
+_SCAN_ITER = "".join((
+    Commands.MOVE_DOWN * 2,
+    "\n",
+    Colors.BLUE,
+    "Elapsed [sec]: {:.1f} | ",
+    Colors.GREEN,
+    "Folders: {:,d} | ",
+    "Files: {:,d} | ",
+    Colors.RED,
+    "Errors: {:,d}",
+    Colors.DEFAULT,
+    Commands.MOVE_UP,
+    Commands.CLEAR_LINE,
+    Colors.DEFAULT,
+    r"{}",
+))
+_SCAN_END = "".join((
+    Commands.MOVE_DOWN,
+    "\n",
+))
+# fmt: on
+
+
+class TerminalSink(ProgressSink):
+    # Kept off stdout, which may carry a streamed report.
+    def start(self):
+        sys.stderr.write(_SCAN_BEGIN)
+
+    def update(self, progress: ScanProgress):
+        msg = _SCAN_ITER.format(
+            progress.elapsed,
+            progress.folders,
+            progress.files,
+            progress.errors,
+            progress.current,
+        )
+        sys.stderr.write(msg)
+        sys.stderr.flush()
+
+    def stop(self):
+        sys.stderr.write(_SCAN_END)
+
+
+@dataclass
+class LoggingSink(ProgressSink):
+    logger: logging.Logger | str = field(default="snoopy")
+    level: int = field(default=logging.INFO, kw_only=True)
+
+    def __post_init__(self):
+        if isinstance(self.logger, str):
+            self.logger = logging.getLogger(self.logger)
+
+    def update(self, progress: ScanProgress):
+        self.logger.log(
+            self.level,
+            "elapsed=%.1fs folders=%d files=%d errors=%d current=%s",
+            progress.elapsed,
+            progress.folders,
+            progress.files,
+            progress.errors,
+            progress.current,
+        )
+
+
+@dataclass
+class CallbackSink(ProgressSink):
+    callback: Callable[[ScanProgress], None]
+
+    def update(self, progress: ScanProgress):
+        self.callback(progress)
+
+
+class _ThreadReporter(threading.Thread):
+    def __init__(
+        self,
+        poll: Callable[[], ScanProgress],
+        sink: ProgressSink,
+        interval: float,
+    ):
+        super().__init__(daemon=True)
+        self.event = threading.Event()
+        self.poll = poll
+        self.sink = sink
+        self.interval = interval
+
+    def run(self):
+        while not self.event.wait(self.interval):
+            self.sink.update(self.poll())
+
+    def start(self):
+        self.sink.start()
+        super().start()
+
+    def stop(self):
+        self.event.set()
+        self.join()
+        self.sink.update(self.poll())
+        self.sink.stop()
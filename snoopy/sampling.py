@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+import os
+import random
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+
+from .core import Dog, Folder
+
+
+@dataclass(slots=True)
+class Interval:
+    mean: float
+    low: float
+    high: float
+
+    def __str__(self):
+        return f"{self.mean:,.0f} [{self.low:,.0f}, {self.high:,.0f}]"
+
+
+@dataclass(slots=True)
+class Estimate:
+    path: Path
+    samples: int
+    confidence: float
+    bytes: Interval
+    files: Interval
+    folders: Interval
+    listed: int
+
+    def __str__(self):
+        return (
+            f"Estimate({self.path}, "
+            f"bytes={self.bytes}, "
+            f"files={self.files}, "
+            f"folders={self.folders}, "
+            f"samples={self.samples:,d}, "
+            f"listed={self.listed:,d}, "
+            f"confidence={self.confidence:.0%})"
+        )
+
+
+class _Running:
+    # Welford's update; byte totals are too large for naive sums of squares.
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def interval(self, z: float):
+        if self.n < 2:
+            return Interval(self.mean, 0.0, math.inf)
+        margin = z * math.sqrt(self.m2 / (self.n - 1) / self.n)
+        return Interval(self.mean, max(self.mean - margin, 0.0), self.mean + margin)
+
+
+class Estimator:
+    # Knuth's estimator: a random walk from the root picks one subfolder
+    # uniformly at each level. A folder reached through fan-outs k1..kd
+    # stands for k1 * ... * kd folders like it, so weighting it by that
+    # product gives an unbiased estimate of the whole tree.
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        *,
+        dog: Dog | None = None,
+        seed: int | None = None,
+    ):
+        if path is None:
+            path = Path(os.getcwd())
+        elif not isinstance(path, Path):
+            path = Path(path)
+
+        if not (path.exists() and path.is_dir()):
+            raise ValueError("path must be an existing directory")
+
+        # Same filters and filesystem rules as a scan, but every listing
+        # is kept and nothing is announced or folded away.
+        self.dog = dataclasses.replace(
+            Dog() if dog is None else dog,
+            on_item=None,
+            on_done=None,
+            keep_items=True,
+            fold_depth=float("inf"),
+            raise_on_error=False,
+            workers=1,
+            checkpoint=None,
+        )
+        self.dog._start(path)
+
+        self.path = path
+        self.rng = random.Random(seed)
+        self.listings = {}
+        self.root = Folder(path)
+        self._bytes = _Running()
+        self._files = _Running()
+        self._folders = _Running()
+
+    @property
+    def samples(self):
+        return self._bytes.n
+
+    def _listing(self, folder: Folder, depth: int):
+        # Walks share their upper levels, so each folder is listed once.
+        listing = self.listings.get(folder.path)
+        if listing is not None:
+            return listing
+
+        dog = self.dog
+        record = dog._enter(folder.path)
+        subfolders = []
+        try:
+            entries = dog._scandir(folder.path, record)
+            for _, subfolder in dog._process(folder, entries, depth, record):
+                subfolders.append(subfolder)
+        except Exception as exc:
+            dog._error(exc, folder, depth, record, path=folder.path, op="scandir")
+
+        # Subfolders were just found and are still empty.
+        listing = folder.bytes, folder.num_files, subfolders
+        folder.items = []
+        self.listings[folder.path] = listing
+        return listing
+
+    def sample(self, n: int = 1):
+        with self.dog._scanning(self.path):
+            for _ in range(n):
+                self._walk()
+        return self
+
+    def _walk(self):
+        bytes = files = folders = 0.0
+        weight = 1
+        folder, depth = self.root, 0
+        while True:
+            folder_bytes, folder_files, subfolders = self._listing(folder, depth)
+            bytes += weight * folder_bytes
+            files += weight * folder_files
+            folders += weight
+            if not subfolders:
+                break
+            weight *= len(subfolders)
+            folder, depth = self.rng.choice(subfolders), depth + 1
+
+        self._bytes.add(bytes)
+        self._files.add(files)
+        # The root itself is not counted, as in Folder.num_deep_folders.
+        self._folders.add(folders - 1)
+
+    def estimate(self, *, confidence: float = 0.95):
+        if not self.samples:
+            raise ValueError("no samples taken yet")
+
+        z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+        return Estimate(
+            path=self.path,
+            samples=self.samples,
+            confidence=confidence,
+            bytes=self._bytes.interval(z),
+            files=self._files.interval(z),
+            folders=self._folders.interval(z),
+            listed=len(self.listings),
+        )
+
+
+def estimate(
+    path: Path | str | None = None,
+    samples: int = 100,
+    *,
+    dog: Dog | None = None,
+    seed: int | None = None,
+    confidence: float = 0.95,
+):
+    estimator = Estimator(path, dog=dog, seed=seed)
+    estimator.sample(samples)
+    return estimator.estimate(confidence=confidence)
@@ -69,10 +69,9 @@ def by_num_files(
     deep_files: bool = True,
 ):
     return _Sorting(
-        ("files", "deep_files")[deep_files],
-        default=[],
+        ("num_files", "num_deep_files")[deep_files],
+        default=-1,
         reverse=reverse,
-        func=len,
     )(tree, inplace=inplace)
 
 
@@ -84,10 +83,9 @@ def by_num_folders(
     deep_folders: bool = True,
 ):
     return _Sorting(
-        ("folders", "deep_folders")[deep_folders],
-        default=[],
+        ("num_folders", "num_deep_folders")[deep_folders],
+        default=-1,
         reverse=reverse,
-        func=len,
     )(tree, inplace=inplace)
 
 
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import array
+import bisect
+import itertools
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+
+from .core import Folder, _counted_bytes, iserror, isfolder
+
+try:
+    import numpy as np
+
+    _numpy_installed_ = True
+except ImportError:
+    _numpy_installed_ = False
+
+_FILE, _FOLDER, _ERROR = 0, 1, 2
+_FOLDED = None
+
+_DAY = 24 * 60 * 60
+_AGE_EDGES = tuple(d * _DAY for d in (1, 7, 30, 90, 365, 3 * 365))
+_SIZE_EDGES = tuple(10**e for e in range(1, 13))
+
+_COLUMNS = {
+    "kind": "b",
+    "depth": "l",
+    "stop": "q",
+    "ext": "l",
+    "files": "q",
+    "bytes": "q",
+    "created": "d",
+    "last_access": "d",
+    "last_modified": "d",
+}
+
+
+def _timestamp(dt: datetime | None):
+    return float("nan") if dt is None else dt.timestamp()
+
+
+@dataclass(slots=True)
+class Group:
+    key: str | None
+    files: int
+    bytes: int
+
+
+@dataclass(slots=True)
+class Bin:
+    lo: float
+    hi: float
+    files: int
+    bytes: int
+
+
+class TreeStats:
+    def __init__(self, tree: Folder, *, use_numpy: bool | None = None):
+        if use_numpy is None:
+            use_numpy = _numpy_installed_
+        if use_numpy and not _numpy_installed_:
+            raise ImportError("numpy is not installed")
+
+        self.tree = tree
+        self.use_numpy = use_numpy
+        self.extensions = [_FOLDED]
+        self._codes = {}
+        self._rows = {}
+
+        for name, typecode in _COLUMNS.items():
+            setattr(self, name, array.array(typecode))
+        self._collect(tree, 0)
+
+        if use_numpy:
+            for name, typecode in _COLUMNS.items():
+                column = np.frombuffer(getattr(self, name), dtype=typecode)
+                setattr(self, name, column)
+
+    def _collect(self, folder: Folder, depth: int):
+        start = len(self.kind)
+        self._rows[id(folder)] = start
+        # Folded content has no extension or size of its own; it is kept
+        # on the folder's row so that range sums still add up.
+        self._append(_FOLDER, depth, 0, folder.folded_files, folder)
+        self.bytes[start] = folder.folded_bytes
+
+        for item in folder.items:
+            if isfolder(item):
+                self._collect(item, depth + 1)
+            elif iserror(item):
+                self._append(_ERROR, depth + 1, 0, 0, None)
+            else:
+                ext = os.path.splitext(item.name)[1].lower()
+                code = self._codes.get(ext)
+                if code is None:
+                    code = self._codes[ext] = len(self.extensions)
+                    self.extensions.append(ext)
+                self._append(_FILE, depth + 1, code, 1, item)
+                self.bytes[-1] = _counted_bytes(item)
+
+        self.stop[start] = len(self.kind)
+
+    def _append(self, kind: int, depth: int, ext: int, files: int, item):
+        self.kind.append(kind)
+        self.depth.append(depth)
+        self.stop.append(len(self.kind))
+        self.ext.append(ext)
+        self.files.append(files)
+        self.bytes.append(0)
+        if item is None:
+            nan = float("nan")
+            self.created.append(nan)
+            self.last_access.append(nan)
+            self.last_modified.append(nan)
+        else:
+            self.created.append(_timestamp(item.created))
+            self.last_access.append(_timestamp(item.last_access))
+            self.last_modified.append(_timestamp(item.last_modified))
+
+    def __len__(self):
+        return len(self.kind)
+
+    def range(self, folder: Folder | None = None):
+        if folder is None:
+            return 0, len(self)
+        try:
+            start = self._rows[id(folder)]
+        except KeyError:
+            raise ValueError(f"{folder.path} is not part of the tree") from None
+        return start, int(self.stop[start])
+
+    def total_bytes(self, folder: Folder | None = None):
+        start, stop = self.range(folder)
+        return self._sum(self.bytes[start:stop])
+
+    def total_files(self, folder: Folder | None = None):
+        start, stop = self.range(folder)
+        return self._sum(self.files[start:stop])
+
+    def _sum(self, column):
+        return int(column.sum() if self.use_numpy else sum(column))
+
+    def by_extension(self, folder: Folder | None = None):
+        start, stop = self.range(folder)
+        files, bytes = self._bincount(
+            self.ext[start:stop],
+            self.files[start:stop],
+            self.bytes[start:stop],
+            len(self.extensions),
+        )
+
+        groups = [
+            Group(ext, n, b)
+            for ext, n, b in zip(self.extensions, files, bytes)
+            if n or b
+        ]
+        groups.sort(key=lambda group: group.bytes, reverse=True)
+        return groups
+
+    def by_age(
+        self,
+        folder: Folder | None = None,
+        *,
+        edges: tuple[float, ...] = _AGE_EDGES,
+        now: float | None = None,
+        timestamp: Literal[
+            "created", "last_access", "last_modified"
+        ] = "last_modified",
+    ):
+        if now is None:
+            now = time.time()
+        times, bytes = self._files(folder, getattr(self, timestamp))
+        if self.use_numpy:
+            ages = now - times
+        else:
+            ages = [now - t for t in times]
+        return self._histogram(ages, bytes, edges)
+
+    def size_histogram(
+        self,
+        folder: Folder | None = None,
+        *,
+        edges: tuple[float, ...] = _SIZE_EDGES,
+    ):
+        sizes, bytes = self._files(folder, self.bytes)
+        return self._histogram(sizes, bytes, edges)
+
+    def _files(self, folder: Folder | None, column):
+        start, stop = self.range(folder)
+        kind = self.kind[start:stop]
+        if self.use_numpy:
+            mask = kind == _FILE
+            return column[start:stop][mask], self.bytes[start:stop][mask]
+        mask = [k == _FILE for k in kind]
+        return (
+            list(itertools.compress(column[start:stop], mask)),
+            list(itertools.compress(self.bytes[start:stop], mask)),
+        )
+
+    def _histogram(self, values, bytes, edges: tuple[float, ...]):
+        if self.use_numpy:
+            keys = np.searchsorted(np.asarray(edges), values, side="right")
+        else:
+            keys = [bisect.bisect(edges, value) for value in values]
+        files, bytes = self._bincount(
+            keys, itertools.repeat(1), bytes, len(edges) + 1
+        )
+
+        edges = (0,) + tuple(edges) + (float("inf"),)
+        return [
+            Bin(lo, hi, n, b)
+            for lo, hi, n, b in zip(edges[:-1], edges[1:], files, bytes)
+        ]
+
+    def _bincount(self, keys, files, bytes, length: int):
+        if self.use_numpy:
+            if not isinstance(files, np.ndarray):
+                files = None
+            counts = np.bincount(keys, weights=files, minlength=length)
+            sums = np.bincount(keys, weights=bytes, minlength=length)
+            return [int(n) for n in counts], [int(b) for b in sums]
+
+        counts = [0] * length
+        sums = [0] * length
+        for key, n, b in zip(keys, files, bytes):
+            counts[key] += n
+            sums[key] += b
+        return counts, sums
+
+    def report(self, folder: Folder | None = None, *, n: int = 10):
+        root = self.tree if folder is None else folder
+        lines = [
+            f"Folder: {root.path}",
+            f"Files: {self.total_files(folder):,d} | "
+            f"Bytes: {self.total_bytes(folder):,d}",
+            "",
+            f"Top {n} extensions:",
+        ]
+        for group in self.by_extension(folder)[:n]:
+            key = "(folded)" if group.key is _FOLDED else group.key or "(none)"
+            lines.append(f"  {key:<12} {group.files:>10,d} {group.bytes:>16,d}")
+
+        lines += ["", "Age (last modified):"]
+        for b in self.by_age(folder):
+            label = f"{_format_days(b.lo):>6} - {_format_days(b.hi):<6}"
+            lines.append(f"  {label} {b.files:>10,d} {b.bytes:>16,d}")
+
+        lines += ["", "File sizes:"]
+        for b in self.size_histogram(folder):
+            label = f"{_format_size(b.lo):>6} - {_format_size(b.hi):<6}"
+            lines.append(f"  {label} {b.files:>10,d} {b.bytes:>16,d}")
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
+
+
+def _format_days(seconds: float):
+    if seconds == float("inf"):
+        return "inf"
+    return f"{seconds / _DAY:.0f}d"
+
+
+def _format_size(value: float):
+    if value == float("inf"):
+        return "inf"
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1000:
+            return f"{value:.0f}{unit}"
+        value /= 1000
+    return f"{value:.0f}TB"
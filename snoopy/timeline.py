@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Literal
+
+from .core import Dog, Folder, _counted_bytes, isfile, isfolder
+
+_VERSION = 1
+_MANIFEST = "manifest.json"
+
+
+@dataclass(slots=True)
+class Scan:
+    id: int
+    when: datetime
+    kind: Literal["base", "delta"]
+    entries: int
+
+
+@dataclass(slots=True)
+class Point:
+    when: datetime
+    bytes: int | None
+    files: int | None
+    folders: int | None
+
+
+def _totals(tree: Folder):
+    # Deep totals of every folder, keyed by its path relative to the root.
+    totals = {}
+
+    def visit(folder: Folder):
+        bytes = folder.folded_bytes
+        files = folder.num_files
+        folders = folder.folded_folders
+        for item in folder.items:
+            if isfolder(item):
+                b, f, d = visit(item)
+                bytes, files, folders = bytes + b, files + f, folders + d + 1
+            elif isfile(item):
+                bytes += _counted_bytes(item)
+        key = folder.path.relative_to(tree.path).as_posix()
+        totals[key] = [bytes, files, folders]
+        return bytes, files, folders
+
+    visit(tree)
+    return totals
+
+
+def _diff(old: dict[str, list[int]], new: dict[str, list[int]]):
+    changed = {key: value for key, value in new.items() if old.get(key) != value}
+    removed = [key for key in old if key not in new]
+    return changed, removed
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, mode="wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp, path)
+
+
+class SnapshotStore:
+    # Each scan keeps only the folder totals that changed since the one
+    # before it. A full base is written again once the deltas since the
+    # last one add up to more than rebase_ratio times its size, so that
+    # rebuilding a state never replays more than that.
+    def __init__(self, path: str | Path, *, rebase_ratio: float = 0.5):
+        self.path = Path(path)
+        self.rebase_ratio = rebase_ratio
+        self.root = None
+        self.scans = []
+        self._latest = None
+
+        manifest = self.path / _MANIFEST
+        if manifest.exists():
+            with open(manifest, encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") != _VERSION:
+                raise ValueError(f"unsupported snapshot store version in {manifest}")
+            self.root = data["root"]
+            self.scans = [
+                Scan(
+                    id=scan["id"],
+                    when=datetime.fromisoformat(scan["when"]),
+                    kind=scan["kind"],
+                    entries=scan["entries"],
+                )
+                for scan in data["scans"]
+            ]
+
+    def __len__(self):
+        return len(self.scans)
+
+    def _file(self, scan: Scan):
+        return self.path / f"{scan.id:06d}.{scan.kind}.json.gz"
+
+    def _read(self, scan: Scan):
+        with gzip.open(self._file(scan), mode="rt", encoding="utf-8") as file:
+            return json.load(file)
+
+    def _key(self, path: str | Path):
+        path = Path(path)
+        if path.is_absolute():
+            path = path.relative_to(self.root)
+        return path.as_posix()
+
+    def add(
+        self,
+        source: Folder | str | Path,
+        *,
+        when: datetime | None = None,
+        dog: Dog | None = None,
+    ):
+        if not isfolder(source):
+            # Only folder totals are stored, so files need not be kept.
+            if dog is None:
+                dog = Dog(fold_files=True)
+            # Resolved, so that every run records the same root.
+            source = dog.snoop(Path(source).resolve())
+
+        root = source.path.resolve()
+        if self.root is None:
+            self.root = str(root)
+        elif Path(self.root) != root:
+            raise ValueError(f"store tracks {self.root}, not {root}")
+
+        totals = _totals(source)
+        scan = Scan(
+            id=len(self.scans),
+            when=datetime.now() if when is None else when,
+            kind="base",
+            entries=len(totals),
+        )
+        record = {"folders": totals}
+
+        if self.scans:
+            changed, removed = _diff(self.state(), totals)
+            entries = len(changed) + len(removed)
+            base = max(i for i, s in enumerate(self.scans) if s.kind == "base")
+            since_base = sum(s.entries for s in self.scans[base + 1 :])
+            if since_base + entries <= self.rebase_ratio * self.scans[base].entries:
+                scan.kind, scan.entries = "delta", entries
+                record = {"changed": changed, "removed": removed}
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        _write_atomic(self._file(scan), gzip.compress(data))
+
+        self.scans.append(scan)
+        self._latest = totals
+        self._write_manifest()
+        return scan
+
+    def _write_manifest(self):
+        manifest = {
+            "version": _VERSION,
+            "root": self.root,
+            "scans": [
+                {
+                    "id": scan.id,
+                    "when": scan.when.isoformat(),
+                    "kind": scan.kind,
+                    "entries": scan.entries,
+                }
+                for scan in self.scans
+            ],
+        }
+        data = json.dumps(manifest, indent=2).encode("utf-8")
+        _write_atomic(self.path / _MANIFEST, data)
+
+    def state(self, scan: int = -1):
+        if not self.scans:
+            raise ValueError("the store has no scans yet")
+        index = range(len(self.scans))[scan]
+        if index == len(self.scans) - 1 and self._latest is not None:
+            return dict(self._latest)
+
+        base = max(i for i in range(index + 1) if self.scans[i].kind == "base")
+        totals = self._read(self.scans[base])["folders"]
+        for delta in self.scans[base + 1 : index + 1]:
+            record = self._read(delta)
+            totals.update(record["changed"])
+            for key in record["removed"]:
+                del totals[key]
+
+        if index == len(self.scans) - 1:
+            self._latest = dict(totals)
+        return totals
+
+    def history(self, path: str | Path):
+        key = self._key(path)
+        points = []
+        value = None
+        # Each file is only searched for the one key; no state is rebuilt.
+        for scan in self.scans:
+            record = self._read(scan)
+            if scan.kind == "base":
+                value = record["folders"].get(key)
+            elif key in record["changed"]:
+                value = record["changed"][key]
+            elif key in record["removed"]:
+                value = None
+
+            if value is None:
+                points.append(Point(scan.when, None, None, None))
+            else:
+                points.append(Point(scan.when, *value))
+        return points
+
+
+def history(store: SnapshotStore | str | Path, path: str | Path):
+    if not isinstance(store, SnapshotStore):
+        store = SnapshotStore(store)
+    return store.history(path)
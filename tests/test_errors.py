@@ -0,0 +1,138 @@
+import errno
+import io
+import os
+
+import pytest
+
+from snoopy import Dog, export
+from snoopy.core import _list_dir, isfile, iserror
+
+
+class BrokenEntry:
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.name = os.path.basename(self.path)
+
+    def is_dir(self, *, follow_symlinks=True):
+        return False
+
+    def is_file(self, *, follow_symlinks=True):
+        return True
+
+    def is_symlink(self):
+        return False
+
+    def stat(self, *, follow_symlinks=True):
+        raise FileNotFoundError(errno.ENOENT, "No such file or directory", self.path)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "x.txt").write_text("x")
+    (tmp_path / "top.txt").write_text("top")
+    return tmp_path
+
+
+def _errors(folder):
+    return [item for item in folder.items if iserror(item)]
+
+
+def _names(folder):
+    return sorted(item.name for item in folder.items if isfile(item))
+
+
+@pytest.fixture(params=[1, 4], ids=["sequential", "parallel"])
+def workers(request):
+    return request.param
+
+
+def test_scandir_error(tree, workers):
+    def list_dir(path):
+        if path.name == "a":
+            raise PermissionError(errno.EACCES, "Permission denied", os.fspath(path))
+        return _list_dir(path)
+
+    dog = Dog(list_dir=list_dir, raise_on_error=False, workers=workers)
+    root = dog.snoop(tree)
+
+    a, b = sorted(root.folders, key=lambda folder: folder.name)
+    [error] = _errors(a)
+    assert error.op == "scandir"
+    assert error.errno == errno.EACCES
+    assert error.path == tree / "a"
+    assert error.args == ("PermissionError", "Permission denied")
+    assert _names(b) == ["x.txt"]
+    assert _names(root) == ["top.txt"]
+    assert dog.error_count == 1
+
+
+def test_stat_error(tree, workers):
+    def list_dir(path):
+        entries = _list_dir(path)
+        if path == tree:
+            entries.append(BrokenEntry(path / "gone.txt"))
+        return entries
+
+    dog = Dog(list_dir=list_dir, raise_on_error=False, workers=workers)
+    root = dog.snoop(tree)
+
+    [error] = _errors(root)
+    assert error.op == "stat"
+    assert error.errno == errno.ENOENT
+    assert error.path == tree / "gone.txt"
+    assert _names(root) == ["top.txt"]
+    assert len(root.folders) == 2
+
+
+def test_callback_error(tree, workers):
+    def on_item(item, parent):
+        if isfile(item) and item.name == "top.txt":
+            raise ValueError("boom")
+
+    dog = Dog(on_item=on_item, raise_on_error=False, workers=workers)
+    root = dog.snoop(tree)
+
+    [error] = _errors(root)
+    assert error.op == "callback"
+    assert error.errno is None
+    assert error.path == tree / "top.txt"
+    assert error.args == ("ValueError", "boom")
+    assert _names(root) == ["top.txt"]
+
+
+def test_raise_on_error(tree, workers):
+    def list_dir(path):
+        if path.name == "b":
+            raise PermissionError(errno.EACCES, "Permission denied", os.fspath(path))
+        return _list_dir(path)
+
+    dog = Dog(list_dir=list_dir, workers=workers)
+    with pytest.raises(PermissionError):
+        dog.snoop(tree)
+
+
+@pytest.mark.parametrize("ndjson", [True, False])
+def test_json_round_trip(tree, ndjson):
+    def list_dir(path):
+        if path.name == "a":
+            raise PermissionError(errno.EACCES, "Permission denied", os.fspath(path))
+        entries = _list_dir(path)
+        if path == tree:
+            entries.append(BrokenEntry(path / "gone.txt"))
+        return entries
+
+    root = Dog(list_dir=list_dir, raise_on_error=False).snoop(tree)
+    root.deep_errors[0].hide()
+
+    fp = io.StringIO()
+    export.export_json(root, fp, ndjson=ndjson)
+    fp.seek(0)
+    loaded = export.load_json(fp)
+
+    def key(error):
+        return error.op, error.path, error.errno, error.args, error.when, error.hidden
+
+    assert sorted(map(key, loaded.deep_errors)) == sorted(map(key, root.deep_errors))
+    assert len(loaded.deep_errors) == 2
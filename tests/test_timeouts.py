@@ -0,0 +1,80 @@
+import errno
+import os
+import threading
+import time
+
+import pytest
+
+from snoopy import Dog
+from snoopy.core import _list_dir, iserror
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ("d0", "d1"):
+        (tmp_path / name / "sub").mkdir(parents=True)
+        (tmp_path / name / "sub" / "x.txt").write_text("x")
+    return tmp_path
+
+
+def _sleeping(slow: str, seconds: float):
+    def list_dir(path):
+        if path.name == slow:
+            time.sleep(seconds)
+        return _list_dir(path)
+
+    return list_dir
+
+
+def _threads_settle(count: int, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while threading.active_count() > count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return threading.active_count()
+
+
+@pytest.fixture(params=[1, 4], ids=["sequential", "parallel"])
+def workers(request):
+    return request.param
+
+
+def test_slow_folder_is_skipped_alone(tree, workers):
+    dog = Dog(
+        list_dir=_sleeping("d0", 0.5),
+        list_timeout=0.1,
+        raise_on_error=False,
+        workers=workers,
+    )
+    root = dog.snoop(tree)
+
+    d0, d1 = sorted(root.folders, key=lambda folder: folder.name)
+    [error] = [item for item in d0.items if iserror(item)]
+    assert error.op == "scandir"
+    assert error.errno == errno.ETIMEDOUT
+    assert error.path == tree / "d0"
+
+    # The root's own filesystem stays listed; only the folder is remembered.
+    assert d1.num_deep_files == 1
+    assert not d1.deep_errors
+    assert dog.slow_mounts == {os.path.abspath(tree / "d0")}
+
+    tic = time.monotonic()
+    root = dog.snoop(tree)
+    assert time.monotonic() - tic < 0.5
+    assert len(root.deep_errors) == 1
+    assert root.num_deep_files == 1
+
+
+def test_idle_threads_end_with_the_scan(tree, workers):
+    before = threading.active_count()
+    dog = Dog(list_timeout=1, workers=workers)
+    for _ in range(5):
+        dog.snoop(tree)
+    assert _threads_settle(before) == before
+
+
+def test_hung_thread_ends_once_its_call_returns(tree):
+    before = threading.active_count()
+    dog = Dog(list_dir=_sleeping("d0", 0.3), list_timeout=0.05, raise_on_error=False)
+    dog.snoop(tree)
+    assert _threads_settle(before) == before